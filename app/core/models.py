@@ -35,7 +35,7 @@ class User(Base):
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     username = Column(String, unique=True, nullable=False)
     password = Column(String, nullable=False)
-    role = Column(String, nullable=False, default="employee")
+    role = Column(String, nullable=False, default="employee", index=True) # User lists are filtered by role
     created_date = Column(DateTime, nullable=False, default=datetime.datetime.now)
     is_active = Column(Boolean, nullable=False, default=True)
 
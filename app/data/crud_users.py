@@ -1,8 +1,9 @@
 import logging
 
-from sqlalchemy.orm import Session
+from sqlalchemy import func, Row
+from sqlalchemy.orm import Session, defer
 from sqlalchemy.exc import IntegrityError
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 from app.core.models import User
 from app.constants import EMPLOYEE_ROLE # Use constant
@@ -16,10 +17,33 @@ def get_user_by_username(db: Session, username: str) -> Optional[User]:
     return db.query(User).filter(User.username == username).first()
 
 def get_users_by_roles(db: Session, roles: List[str]) -> List[User]: # Return List[User]
-    return db.query(User).filter(User.role.in_(roles)).order_by(User.username).all() # Added ordering
+    # List views never read the bcrypt hash, so it is left out of the SELECT
+    return db.query(User).options(defer(User.password)).filter(User.role.in_(roles)).order_by(User.username).all() # Added ordering
 
 def get_all_users(db: Session) -> List[User]: # Return List[User]
-    return db.query(User).order_by(User.username).all() # Added ordering
+    return db.query(User).options(defer(User.password)).order_by(User.username).all() # Added ordering
+
+# The only columns the users list shows; pages are read as plain rows instead of hydrated, session-bound User objects
+_USER_ROW_COLUMNS = (User.id, User.username, User.role, User.created_date, User.is_active)
+# Sort keys the users table can request; text columns compare case-insensitively, like the in-memory table sort
+_USER_SORT_COLUMNS = {
+    "id": User.id, "username": func.lower(User.username), "role": func.lower(User.role),
+    "created_date": User.created_date, "is_active": User.is_active,
+}
+
+def get_users_page(db: Session, roles: Optional[List[str]], offset: int, limit: int,
+                   sort_key: Optional[str] = None, ascending: bool = True, search: str = "") -> Tuple[List[Row], int]:
+    """Returns one page of user rows (id, username, role, created_date, is_active; roles=None means all roles)
+    plus the total number matching the search."""
+    query = db.query(*_USER_ROW_COLUMNS)
+    if roles is not None: query = query.filter(User.role.in_(roles))
+    if search:
+        pattern = "%" + search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        query = query.filter(User.username.ilike(pattern, escape="\\") | User.role.ilike(pattern, escape="\\"))
+    total = query.count()
+    sort_column = _USER_SORT_COLUMNS.get(sort_key, User.username)
+    query = query.order_by(sort_column if ascending else sort_column.desc(), User.id)
+    return query.offset(offset).limit(limit).all(), total
 
 
 def create_user(db: Session, username: str, password: str, role: str = EMPLOYEE_ROLE) -> User:
@@ -33,6 +33,9 @@ def init_db():
     # DB_BASE_DIR is already created by main.py at this point
     logger.info(f"Initializing database at: {SQLALCHEMY_DATABASE_URL}")
     Base.metadata.create_all(bind=engine, checkfirst=True)
+    # create_all skips tables that already exist, so indexes added to the models later are created here
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes: index.create(bind=engine, checkfirst=True)
     logger.info("Database tables checked/created.")
 
     config_service = ConfigurationService()
@@ -2,7 +2,7 @@ import datetime
 import logging
 from typing import List, Dict, Tuple, Optional, Any
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, contains_eager
 
 from app.constants import REVERSE_TICKET_ORDER, FORWARD_TICKET_ORDER, GAME_LENGTH, BOOK_LENGTH
 from app.core.exceptions import ValidationError, DatabaseError, GameNotFoundError
@@ -13,12 +13,14 @@ logger = logging.getLogger("lottery_manager_app")
 
 class SalesEntryService:
     def get_active_books_for_sales_display(self, db: Session) -> List[Book]:
-        return db.query(Book).options(
-            joinedload(Book.game)
+        # The inner join on Book.game is needed for the expiry filter anyway; contains_eager populates
+        # book.game from that same join instead of joinedload adding a second (outer) join.
+        return db.query(Book).join(Book.game).options(
+            contains_eager(Book.game)
         ).filter(
             Book.is_active == True,
             GameModel.is_expired == False # Ensure game is also not expired
-        ).join(Book.game).order_by(Book.game_id, Book.book_number).all()
+        ).order_by(GameModel.game_number, Book.book_number).all() # The order the sales table displays
 
     def get_or_create_book_for_sale(self, db: Session, game_number_str: str, book_number_str: str) -> Book:
         if not (game_number_str.isdigit() and len(game_number_str) == GAME_LENGTH):
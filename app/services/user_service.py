@@ -1,5 +1,7 @@
 import logging
-from typing import Optional, List, Type
+import time
+from typing import Optional, List, Type, Tuple, Dict
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 import re # For regex-based validation
 
@@ -19,6 +21,17 @@ USERNAME_REGEX = re.compile(r"^[a-zA-Z0-9][a-zA-Z0-9_.-]*[a-zA-Z0-9]$")
 # Password validation constants
 MIN_PASSWORD_LENGTH = 6
 
+# User list pages are reused until a write through UserService bumps the version; the TTL covers writes made elsewhere
+USERS_QUERY_CACHE_TTL_SECONDS = 5.0
+USERS_QUERY_CACHE_MAX_ENTRIES = 64
+_users_query_cache: Dict[tuple, Tuple[int, float, List[Row], int]] = {} # key -> (version, fetched_at, users, total)
+_users_query_version = 0
+
+def _invalidate_user_queries():
+    global _users_query_version
+    _users_query_version += 1 # Also discards results of fetches that were in flight during the write
+    _users_query_cache.clear()
+
 
 class UserService:
     def _validate_username(self, username: str):
@@ -77,6 +90,20 @@ class UserService:
     def get_all_users(self, db: Session) -> List[User]:
         return crud_users.get_all_users(db)
 
+    def get_users_page(self, db: Session, roles: Optional[List[str]], offset: int, limit: int,
+                       sort_key: Optional[str] = None, ascending: bool = True, search: str = "") -> Tuple[List[Row], int]:
+        if roles is not None:
+            for role in roles: self._validate_role(role)
+        key = (None if roles is None else frozenset(roles), offset, limit, sort_key, ascending, search)
+        cached = _users_query_cache.get(key)
+        if cached and cached[0] == _users_query_version and time.monotonic() - cached[1] < USERS_QUERY_CACHE_TTL_SECONDS:
+            return list(cached[2]), cached[3]
+        version = _users_query_version
+        users, total = crud_users.get_users_page(db, roles, offset, limit, sort_key, ascending, search)
+        if len(_users_query_cache) >= USERS_QUERY_CACHE_MAX_ENTRIES: _users_query_cache.clear()
+        _users_query_cache[key] = (version, time.monotonic(), users, total)
+        return list(users), total
+
     def any_users_exist(self, db: Session) -> bool:
         return crud_users.any_users_exist(db)
 
@@ -89,7 +116,9 @@ class UserService:
         # crud_users.create_user handles DatabaseError if username (unique constraint) exists
         try:
             logger.info(f"Attempting to create new user '{username}' with role '{role}'.")
-            return crud_users.create_user(db, username, password, role)
+            user = crud_users.create_user(db, username, password, role)
+            _invalidate_user_queries()
+            return user
         except DatabaseError as e: # Re-raise specific DB errors
             raise e
         except Exception as e_unhandled: # Catch other unexpected issues from CRUD
@@ -115,7 +144,9 @@ class UserService:
         # The CRUD operation will handle checking for username uniqueness if username is changed.
         try:
             logger.info(f"Attempting to update user ID {user_id}. Changes: username='{username}', role='{role}', is_active='{is_active}'. Password change attempted: {'Yes' if password else 'No'}.")
-            return crud_users.update_user(db, user_id, username, password, role, is_active)
+            user = crud_users.update_user(db, user_id, username, password, role, is_active)
+            _invalidate_user_queries()
+            return user
         except DatabaseError as e: # Re-raise specific DB errors
             raise e
         except Exception as e_unhandled: # Catch other unexpected issues from CRUD
@@ -135,7 +166,9 @@ class UserService:
                 raise ValidationError("Cannot delete the last Salesperson account.")
 
         logger.info(f"Attempting to delete user '{user_to_delete.username}' (ID: {user_to_delete.id}).")
-        return crud_users.delete_user(db, user_id)
+        deleted = crud_users.delete_user(db, user_id)
+        _invalidate_user_queries()
+        return deleted
 
     def deactivate_user(self, db: Session, user_id: int, current_acting_user_id: Optional[int] = None) -> User:
         user = self.get_user_by_id(db, user_id)
@@ -146,7 +179,9 @@ class UserService:
         if not user.is_active:
             return user # Already inactive
         logger.info(f"Deactivating user '{user.username}' (ID: {user.id}) by user ID {current_acting_user_id}.")
-        return crud_users.update_user(db, user_id, is_active=False)
+        user = crud_users.update_user(db, user_id, is_active=False)
+        _invalidate_user_queries()
+        return user
 
     def reactivate_user(self, db: Session, user_id: int) -> User:
         user = self.get_user_by_id(db, user_id)
@@ -157,4 +192,6 @@ class UserService:
         if user.is_active:
             return user # Already active
         logger.info(f"Reactivating user '{user.username}' (ID: {user.id}).")
-        return crud_users.update_user(db, user_id, is_active=True)
\ No newline at end of file
+        user = crud_users.update_user(db, user_id, is_active=True)
+        _invalidate_user_queries()
+        return user
\ No newline at end of file
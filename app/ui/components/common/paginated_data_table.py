@@ -1,6 +1,7 @@
 import logging
+from contextlib import contextmanager
 from math import ceil
-from typing import List, Callable, Optional, Any, Dict, TypeVar, Generic
+from typing import List, Callable, Optional, Any, Dict, TypeVar, Generic, Tuple
 import flet as ft
 import datetime
 import inspect
@@ -14,7 +15,7 @@ class PaginatedDataTable(ft.Container, Generic[T]):
     def __init__(
             self,
             page: ft.Page,
-            fetch_all_data_func: Callable[[Any], List[T]],
+            fetch_all_data_func: Optional[Callable[[Any], List[T]]],
             column_definitions: List[Dict[str, Any]],
             action_cell_builder: Optional[Callable[[T, 'PaginatedDataTable[T]'], ft.DataCell]],
             rows_per_page: int = 10,
@@ -28,11 +29,15 @@ class PaginatedDataTable(ft.Container, Generic[T]):
             data_row_max_height: int = 48,
             default_search_enabled: bool = True,
             show_pagination: bool = True,
+            fetch_page_func: Optional[Callable[[Any, int, int, Optional[str], bool, str], Tuple[List[T], int]]] = None,
             **kwargs
     ):
         super().__init__(expand=True, padding=ft.padding.symmetric(horizontal=5), **kwargs)
         self.page = page
         self.fetch_all_data_func = fetch_all_data_func
+        # When set, paging/sorting/search run in SQL: fetch_page_func(db, offset, limit, sort_key, ascending, search) -> (page_items, total_count)
+        self.fetch_page_func = fetch_page_func
+        self._total_row_count: int = 0 # Total matches across all pages; only used with fetch_page_func
         self.column_definitions = column_definitions
         self.action_cell_builder = action_cell_builder
         self.rows_per_page = rows_per_page
@@ -48,6 +53,9 @@ class PaginatedDataTable(ft.Container, Generic[T]):
         self._current_sort_ascending: bool = initial_sort_ascending
         self._current_page_number: int = 1
         self._last_search_term: str = ""
+        self._batch_depth: int = 0 # > 0 while inside batch_updates(); table updates are deferred to its exit
+        self._formatter_param_counts: Dict[Callable, int] = {}
+        self._snackbar: Optional[ft.SnackBar] = None # One SnackBar per table, refilled per message instead of piling up in the overlay
 
         self.datatable = ft.DataTable(
             columns=[],
@@ -114,6 +122,19 @@ class PaginatedDataTable(ft.Container, Generic[T]):
             elevation=card_elevation,
         )
 
+    @property
+    def is_batching(self) -> bool: return self._batch_depth > 0
+
+    @contextmanager
+    def batch_updates(self):
+        """Defers this table's control updates; the outermost block sends one page update on exit."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self.page and self.page.controls: self.page.update()
+
     def _get_column_def_by_key(self, key: str) -> Optional[Dict[str, Any]]:
         for col_def in self.column_definitions:
             if col_def['key'] == key:
@@ -215,56 +236,79 @@ class PaginatedDataTable(ft.Container, Generic[T]):
 
 
 
+    def _item_matches_search(self, item: T, searchable_keys: List[str]) -> bool:
+        for key in searchable_keys:
+            value: Any
+            if isinstance(item, dict):
+                value = item.get(key)
+            else: # Assume object
+                value = getattr(item, key, None)
+
+            col_def_for_key = self._get_column_def_by_key(key)
+            display_formatter = col_def_for_key.get('display_formatter') if col_def_for_key else None
+
+            str_value = ""
+            if display_formatter:
+                num_params = 0
+                if callable(display_formatter):
+                    try:
+                        num_params = len(inspect.signature(display_formatter).parameters)
+                    except ValueError:
+                        pass
+
+                formatted_control: Optional[ft.Control] = None
+                if num_params == 2:
+                    formatted_control = display_formatter(value, item)
+                elif num_params == 1:
+                    formatted_control = display_formatter(value)
+                else:
+                    formatted_control = ft.Text(str(value) if value is not None else "")
+
+
+                if isinstance(formatted_control, ft.Text):
+                    str_value = str(formatted_control.value).lower()
+                elif value is not None:
+                    str_value = str(value).lower()
+            elif value is not None:
+                str_value = str(value).lower()
+
+            if self._last_search_term in str_value:
+                return True
+        return False
+
+    def _fetch_current_page(self):
+        """Loads only the current page for the active sort and search, plus the total number of matches."""
+        search = self._last_search_term if self.default_search_enabled else ""
+        fetch_args = (self._current_sort_column_key, self._current_sort_ascending, search)
+        try:
+            with get_db_session() as db:
+                offset = (self._current_page_number - 1) * self.rows_per_page
+                items, total = self.fetch_page_func(db, offset, self.rows_per_page, *fetch_args)
+                if not items and offset and total: # The page no longer exists (e.g. an edited item left the search results)
+                    self._current_page_number = ceil(total / self.rows_per_page)
+                    items, total = self.fetch_page_func(db, (self._current_page_number - 1) * self.rows_per_page, self.rows_per_page, *fetch_args)
+        except Exception as e:
+            logger.error(f"Error fetching table page: {e}", exc_info=True)
+            items, total = [], 0
+            self.show_error_snackbar(f"Error loading data: {type(e).__name__}")
+        self._displayed_data = items
+        self._total_row_count = total
+
+    def _total_rows(self) -> int:
+        return self._total_row_count if self.fetch_page_func else len(self._displayed_data)
+
     def _filter_and_sort_displayed_data(self, search_term: str = ""):
         self._last_search_term = search_term.lower().strip()
+        if self.fetch_page_func:
+            self._fetch_current_page()
+            self._update_datatable_rows()
+            return
 
         if not self._last_search_term or not self.default_search_enabled:
             self._displayed_data = list(self._all_unfiltered_data)
         else:
-            self._displayed_data = []
             searchable_keys = [cd['key'] for cd in self.column_definitions if cd.get('searchable', True)]
-            for item in self._all_unfiltered_data:
-                found = False
-                for key in searchable_keys:
-                    value: Any
-                    if isinstance(item, dict):
-                        value = item.get(key)
-                    else: # Assume object
-                        value = getattr(item, key, None)
-
-                    col_def_for_key = self._get_column_def_by_key(key)
-                    display_formatter = col_def_for_key.get('display_formatter') if col_def_for_key else None
-
-                    str_value = ""
-                    if display_formatter:
-                        num_params = 0
-                        if callable(display_formatter):
-                            try:
-                                num_params = len(inspect.signature(display_formatter).parameters)
-                            except ValueError:
-                                pass
-
-                        formatted_control: Optional[ft.Control] = None
-                        if num_params == 2:
-                            formatted_control = display_formatter(value, item)
-                        elif num_params == 1:
-                            formatted_control = display_formatter(value)
-                        else:
-                            formatted_control = ft.Text(str(value) if value is not None else "")
-
-
-                        if isinstance(formatted_control, ft.Text):
-                            str_value = str(formatted_control.value).lower()
-                        elif value is not None:
-                            str_value = str(value).lower()
-                    elif value is not None:
-                        str_value = str(value).lower()
-
-                    if self._last_search_term in str_value:
-                        found = True
-                        break
-                if found:
-                    self._displayed_data.append(item)
+            self._displayed_data = [item for item in self._all_unfiltered_data if self._item_matches_search(item, searchable_keys)]
 
         if self._current_sort_column_key:
             sort_key_attr = self._current_sort_column_key
@@ -275,45 +319,40 @@ class PaginatedDataTable(ft.Container, Generic[T]):
         self._update_datatable_rows()
 
 
-    def _build_datarow(self, item: T) -> ft.DataRow:
-        cells: List[ft.DataCell] = []
-        for col_def in self.column_definitions:
-            key = col_def['key']
+    def _build_cell_content(self, col_def: Dict[str, Any], item: T) -> ft.Control:
+        key = col_def['key']
 
-            raw_value: Any
-            if isinstance(item, dict):
-                raw_value = item.get(key)
-            else: # Assume object
-                raw_value = getattr(item, key, None)
+        raw_value: Any
+        if isinstance(item, dict):
+            raw_value = item.get(key)
+        else: # Assume object
+            raw_value = getattr(item, key, None)
+
+        formatter = col_def.get('display_formatter')
 
-            formatter = col_def.get('display_formatter')
+        if formatter and callable(formatter):
+            try:
+                num_params = self._formatter_param_counts.get(formatter)
+                if num_params is None: # inspect.signature is slow; formatters are fixed per column, so inspect each once
+                    num_params = self._formatter_param_counts[formatter] = len(inspect.signature(formatter).parameters)
 
-            cell_content: ft.Control
-            if formatter and callable(formatter):
+                if num_params == 2:
+                    return formatter(raw_value, item)
+                elif num_params == 1:
+                    return formatter(raw_value)
+            except ValueError:
                 try:
-                    sig = inspect.signature(formatter)
-                    num_params = len(sig.parameters)
-
-                    if num_params == 2:
-                        cell_content = formatter(raw_value, item)
-                    elif num_params == 1:
-                        cell_content = formatter(raw_value)
-                    else:
-                        cell_content = ft.Text(str(raw_value) if raw_value is not None else "", size=12.5)
-                except ValueError:
-                    try:
-                        cell_content = formatter(raw_value)
-                    except TypeError:
-                        cell_content = ft.Text(str(raw_value) if raw_value is not None else "", size=12.5)
-                except Exception as e:
-                    cell_content = ft.Text(str(raw_value) if raw_value is not None else "", size=12.5)
-            else:
-                cell_content = ft.Text(str(raw_value) if raw_value is not None else "", size=12.5)
-            cells.append(ft.DataCell(cell_content))
+                    return formatter(raw_value)
+                except TypeError:
+                    pass
+            except Exception as e:
+                pass
+        return ft.Text(str(raw_value) if raw_value is not None else "", size=12.5)
 
+    def _build_datarow(self, item: T) -> ft.DataRow:
+        cells: List[ft.DataCell] = [ft.DataCell(self._build_cell_content(col_def, item)) for col_def in self.column_definitions]
         if self.action_cell_builder:
-            action_cell = self.action_cell_builder(item, self)
-            cells.append(action_cell)
+            cells.append(self.action_cell_builder(item, self))
 
         return ft.DataRow(cells=cells, color={"hovered": ft.Colors.with_opacity(0.05, ft.Colors.PRIMARY)})
 
@@ -358,22 +397,25 @@ class PaginatedDataTable(ft.Container, Generic[T]):
 
             else:
                 self.datatable.rows = []
+        elif self.fetch_page_func: # _displayed_data already is the current page
+            self.datatable.rows = [self._build_datarow(item) for item in self._displayed_data]
         else:
+            max_page = max(1, ceil(len(self._displayed_data) / self.rows_per_page))
+            if self._current_page_number > max_page: self._current_page_number = max_page # e.g. an edited item left the search results
             start_index = (self._current_page_number - 1) * self.rows_per_page
             end_index = start_index + self.rows_per_page
             paginated_items = self._displayed_data[start_index:end_index]
             self.datatable.rows = [self._build_datarow(item) for item in paginated_items]
 
         self._update_pagination_controls()
-        if self.page and self.page.controls:
-            self.page.update()
+        if self.page_info_text.page and not self.is_batching: self.update() # Only the table and its pager changed, not the whole page
 
 
     def _update_pagination_controls(self):
         if not self.page_info_text.page or not self.show_pagination:
             return
 
-        total_rows = len(self._displayed_data)
+        total_rows = self._total_rows()
         total_pages = ceil(total_rows / self.rows_per_page) if total_rows > 0 else 1
         total_pages = max(1, total_pages)
 
@@ -381,17 +423,21 @@ class PaginatedDataTable(ft.Container, Generic[T]):
         self.prev_button.disabled = self._current_page_number == 1
         self.next_button.disabled = self._current_page_number == total_pages
 
+    def _show_current_page(self):
+        if self.fetch_page_func: self._fetch_current_page()
+        self._update_datatable_rows()
+
     def _prev_page(self, e):
         if self._current_page_number > 1:
             self._current_page_number -= 1
-            self._update_datatable_rows()
+            self._show_current_page()
 
     def _next_page(self, e):
-        total_rows = len(self._displayed_data)
+        total_rows = self._total_rows()
         total_pages = ceil(total_rows / self.rows_per_page) if total_rows > 0 else 1
         if self._current_page_number < total_pages:
             self._current_page_number += 1
-            self._update_datatable_rows()
+            self._show_current_page()
 
     def refresh_data_and_ui(self, search_term: Optional[str] = None):
         if search_term is None:
@@ -399,6 +445,11 @@ class PaginatedDataTable(ft.Container, Generic[T]):
         else:
             self._last_search_term = search_term
 
+        if self.fetch_page_func: # Nothing is held in memory beyond the current page; just reload page 1
+            self._current_page_number = 1
+            self._filter_and_sort_displayed_data(search_term)
+            return
+
         try:
             # Check if fetch_all_data_func expects a db_session argument
             sig = inspect.signature(self.fetch_all_data_func)
@@ -420,8 +471,42 @@ class PaginatedDataTable(ft.Container, Generic[T]):
             self._all_unfiltered_data = [] # Clear data on error to show "No data" message
             self._filter_and_sort_displayed_data("") # This will call _update_datatable_rows
             if self.page:
-                self.page.open(ft.SnackBar(ft.Text(f"Error loading data: {type(e).__name__}"), open=True, bgcolor=ft.Colors.ERROR))
+                self.show_error_snackbar(f"Error loading data: {type(e).__name__}")
+
 
+    def replace_item(self, updated_item: T, key: str = "id") -> bool:
+        """
+        Swaps in an updated copy of an item (matched on `key`) without refetching.
+        If its sort position and search match are unchanged, only its own row is rebuilt and True is returned;
+        otherwise the current page is re-derived from memory (or refetched with fetch_page_func).
+        """
+        get_value = (lambda it: it.get(key)) if isinstance(updated_item, dict) else (lambda it: getattr(it, key, None))
+        target = get_value(updated_item)
+        source = self._displayed_data if self.fetch_page_func else self._all_unfiltered_data
+        idx = next((i for i, item in enumerate(source) if get_value(item) == target), None)
+        if idx is None: # Not loaded yet, so fall back to a fetch
+            if self.fetch_page_func: self._show_current_page()
+            else: self.refresh_data_and_ui(self._last_search_term)
+            return False
+        old_item = source[idx]
+        source[idx] = updated_item
+
+        display_idx = idx if self.fetch_page_func else next((i for i, item in enumerate(self._displayed_data) if item is old_item), None)
+        sort_key = self._current_sort_column_key
+        searching = bool(self._last_search_term) and self.default_search_enabled
+        searchable_keys = [cd['key'] for cd in self.column_definitions if cd.get('searchable', True)] if searching else []
+        if (display_idx is None
+                or (sort_key and self._get_sort_value_for_item(old_item, sort_key) != self._get_sort_value_for_item(updated_item, sort_key))
+                or (searching and not self._item_matches_search(updated_item, searchable_keys))):
+            self._filter_and_sort_displayed_data(self._last_search_term)
+            return False
+
+        self._displayed_data[display_idx] = updated_item
+        row_idx = display_idx if self.fetch_page_func else display_idx - (self._current_page_number - 1) * self.rows_per_page
+        if 0 <= row_idx < len(self.datatable.rows):
+            self.datatable.rows[row_idx] = self._build_datarow(updated_item)
+            if self.datatable.page and not self.is_batching: self.datatable.update()
+        return True
 
     def get_current_search_term(self) -> str:
         return self._last_search_term
@@ -432,9 +517,17 @@ class PaginatedDataTable(ft.Container, Generic[T]):
             self.page.close(current_dialog)
 
         if success_message and self.page:
-            self.page.open(ft.SnackBar(ft.Text(success_message), open=True))
+            self._show_snackbar(success_message)
         self.refresh_data_and_ui(self._last_search_term)
 
+    def _show_snackbar(self, message: str, bgcolor: Optional[str] = None):
+        if self._snackbar is None: self._snackbar = ft.SnackBar(ft.Text())
+        self._snackbar.content.value = message
+        self._snackbar.bgcolor = bgcolor
+        # Always registered through page.open; once mounted, a batch just flips it open and its page update shows it
+        if self.is_batching and self._snackbar.page: self._snackbar.open = True
+        else: self.page.open(self._snackbar)
+
     def show_error_snackbar(self, message: str):
         if self.page:
-            self.page.open(ft.SnackBar(ft.Text(message), open=True, bgcolor=ft.Colors.ERROR))
+            self._show_snackbar(message, ft.Colors.ERROR)
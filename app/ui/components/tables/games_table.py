@@ -135,6 +135,10 @@ class GamesTable(PaginatedDataTable[Game]):
         def _save_edits_handler(e):
             if not self.current_action_game: return
             error_text_edit.value = ""; error_text_edit.visible = False
+            # Bad numbers are flagged on their fields and stop the save; the page update below sends the flags
+            if not NumberDecimalField.validate_many([f for f in (game_number_field, price_field, total_tickets_field) if not f.disabled], flush=False):
+                if self.page: self.page.update()
+                return
 
             name_val = game_name_field.value.strip() if game_name_field.value else None
             game_number_val = game_number_field.get_value_as_int()
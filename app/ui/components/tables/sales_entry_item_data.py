@@ -1,12 +1,33 @@
+import re
 import flet as ft
 from typing import Optional, Callable, Union, Dict # Added Dict
 from app.core.models import Book as BookModel
-from app.constants import REVERSE_TICKET_ORDER, FORWARD_TICKET_ORDER
+from app.constants import REVERSE_TICKET_ORDER
+
+# Optional minus sign followed by digits; anything matching is safe to pass to int()
+_TICKET_NO_RE = re.compile(r"-?\d+")
+
+def _fmt_cents(cents: int) -> str:
+    """Formats an amount in CENTS as "$D.CC" using integer math only."""
+    dollars, rem = divmod(abs(cents), 100)
+    return f"${'-' if cents < 0 else ''}{dollars}.{rem:02d}"
 
 class SalesEntryItemData:
+    # One instance per active book, so no per-instance __dict__
+    __slots__ = (
+        "book_model", "on_change_callback", "book_db_id", "game_db_id", "game_name", "book_number",
+        "game_price_cents", "db_current_ticket_no", "game_total_tickets", "ticket_order",
+        "ui_new_ticket_no_str", "ui_new_ticket_no_ref", "_textfield_error_message",
+        "tickets_sold_calculated", "amount_calculated_cents", "is_processed_for_sale", "all_tickets_sold_confirmed",
+        "row_highlight_color", "unique_id", "_calc_cache_key", "_bulk",
+        "_is_reverse", "_all_sold_ticket_str", "_price_str", "_header_str",
+        "_cached_row", "_details_text", "_price_text", "_cur_tkt_text", "_sold_text", "_amount_text",
+    )
+
     def __init__(self,
                  book_model: BookModel,
-                 on_change_callback: Callable[['SalesEntryItemData'], None]):
+                 on_change_callback: Callable[['SalesEntryItemData'], None],
+                 unique_id: Optional[str] = None):
 
         self.book_model = book_model
         self.on_change_callback = on_change_callback
@@ -30,9 +51,45 @@ class SalesEntryItemData:
         self.all_tickets_sold_confirmed: bool = False
 
         self.row_highlight_color: Optional[str] = None
-        self.unique_id: str = f"book-{self.book_db_id}"
+        self.unique_id: str = unique_id or f"book-{self.book_db_id}"
+        self._calc_cache_key: Optional[tuple] = None # Inputs of the last _calculate_sales run
+        self._bulk: bool = False # While True the owner applies several changes and renders once at the end
+
+        self._cache_book_derived_values()
+
+        # Row controls, created once by to_datarow() and mutated in place afterwards
+        self._cached_row: Optional[ft.DataRow] = None
+        self._details_text: Optional[ft.Text] = None
+        self._price_text: Optional[ft.Text] = None
+        self._cur_tkt_text: Optional[ft.Text] = None
+        self._sold_text: Optional[ft.Text] = None
+        self._amount_text: Optional[ft.Text] = None
+
+    def apply_book_model(self, book_model: BookModel):
+        """Refreshes the book-derived fields from a newly loaded model (e.g. on re-scan)."""
+        self.book_model = book_model
+        self.db_current_ticket_no = book_model.current_ticket_number
+        self.game_name = book_model.game.name if book_model.game else self.game_name
+        self.game_price_cents = book_model.game.price if book_model.game else self.game_price_cents # Use game_price_cents
+        self.game_total_tickets = book_model.game.total_tickets if book_model.game else self.game_total_tickets
+        self.ticket_order = book_model.ticket_order
+        self._cache_book_derived_values()
+        self._refresh_book_details_cells()
+
+    def _cache_book_derived_values(self):
+        # These only change when a new book model is applied, so they stay off the per-keystroke path.
+        self._is_reverse: bool = self.ticket_order == REVERSE_TICKET_ORDER
+        self._all_sold_ticket_str: str = "-1" if self._is_reverse else str(self.game_total_tickets)
+        self._price_str: str = _fmt_cents(self.game_price_cents) # Display in dollars
+        game_number = self.book_model.game.game_number if self.book_model.game else "N/A"
+        self._header_str: str = f"{self.game_name} | Game No: {game_number} | Book No: {self.book_number}"
 
     def _calculate_sales(self) -> bool:
+        calc_key = (self.ui_new_ticket_no_str, self.all_tickets_sold_confirmed, self.db_current_ticket_no,
+                    self.game_total_tickets, self.game_price_cents, self._is_reverse)
+        if calc_key == self._calc_cache_key: return False # Same inputs as the last run, so the same outputs
+        self._calc_cache_key = calc_key
+
         prev_tickets_sold = self.tickets_sold_calculated
         prev_amount_cents = self.amount_calculated_cents
         prev_is_processed = self.is_processed_for_sale
@@ -51,36 +108,31 @@ class SalesEntryItemData:
         valid_input_for_calc = False
 
         if self.all_tickets_sold_confirmed:
-            if self.ticket_order == REVERSE_TICKET_ORDER: new_book_state_after_this_entry = -1
+            if self._is_reverse: new_book_state_after_this_entry = -1
             else: new_book_state_after_this_entry = self.game_total_tickets
             self.is_processed_for_sale = True; valid_input_for_calc = True
         elif not self.ui_new_ticket_no_str:
             self.is_processed_for_sale = False; valid_input_for_calc = True
             new_book_state_after_this_entry = book_state_before_this_entry
-        elif self.ui_new_ticket_no_str == "-" or \
-                (self.ui_new_ticket_no_str.startswith('-') and not self.ui_new_ticket_no_str[1:].isdigit()) or \
-                (not self.ui_new_ticket_no_str.startswith('-') and not self.ui_new_ticket_no_str.isdigit()):
+        elif not _TICKET_NO_RE.fullmatch(self.ui_new_ticket_no_str):
             self.row_highlight_color = ft.Colors.RED_100; self._textfield_error_message = "Invalid number"
         else:
-            try:
-                entered_num = int(self.ui_new_ticket_no_str)
-                is_valid_range = False
-                if self.ticket_order == REVERSE_TICKET_ORDER:
-                    is_valid_range = (-1 <= entered_num <= book_state_before_this_entry) and (entered_num <= self.game_total_tickets -1)
-                else:
-                    is_valid_range = (book_state_before_this_entry <= entered_num <= self.game_total_tickets)
-                if not is_valid_range:
-                    self.row_highlight_color = ft.Colors.RED_100
-                    hint_range = f"-1 to {book_state_before_this_entry}" if self.ticket_order == REVERSE_TICKET_ORDER else f"{book_state_before_this_entry} to {self.game_total_tickets}"
-                    self._textfield_error_message = f"Invalid: {hint_range}"
-                else:
-                    new_book_state_after_this_entry = entered_num
-                    self.is_processed_for_sale = True; valid_input_for_calc = True
-            except ValueError:
-                self.row_highlight_color = ft.Colors.RED_100; self._textfield_error_message = "Not a number"
+            entered_num = int(self.ui_new_ticket_no_str)
+            is_valid_range = False
+            if self._is_reverse:
+                is_valid_range = (-1 <= entered_num <= book_state_before_this_entry) and (entered_num <= self.game_total_tickets -1)
+            else:
+                is_valid_range = (book_state_before_this_entry <= entered_num <= self.game_total_tickets)
+            if not is_valid_range:
+                self.row_highlight_color = ft.Colors.RED_100
+                hint_range = f"-1 to {book_state_before_this_entry}" if self._is_reverse else f"{book_state_before_this_entry} to {self.game_total_tickets}"
+                self._textfield_error_message = f"Invalid: {hint_range}"
+            else:
+                new_book_state_after_this_entry = entered_num
+                self.is_processed_for_sale = True; valid_input_for_calc = True
 
         if valid_input_for_calc and self.is_processed_for_sale:
-            if self.ticket_order == REVERSE_TICKET_ORDER:
+            if self._is_reverse:
                 self.tickets_sold_calculated = book_state_before_this_entry - new_book_state_after_this_entry
             else:
                 self.tickets_sold_calculated = new_book_state_after_this_entry - book_state_before_this_entry
@@ -107,41 +159,37 @@ class SalesEntryItemData:
     def update_scanned_ticket_number(self, new_ticket_str: str):
         self.ui_new_ticket_no_str = new_ticket_str
         self.all_tickets_sold_confirmed = False
-        self._textfield_error_message = None
-        if self.ui_new_ticket_no_ref:
-            self.ui_new_ticket_no_ref.value = self.ui_new_ticket_no_str
-            self.ui_new_ticket_no_ref.error_text = None
-            if self.ui_new_ticket_no_ref.page: self.ui_new_ticket_no_ref.update()
-        if self._calculate_sales(): self.on_change_callback(self)
+        if self.ui_new_ticket_no_ref: self.ui_new_ticket_no_ref.value = self.ui_new_ticket_no_str
+        if self._calculate_sales(): self.on_change_callback(self) # The row update also carries the TextField
+        elif not self._bulk: self._push_textfield_update()
 
     def confirm_all_sold(self):
         self.all_tickets_sold_confirmed = True
-        if self.ticket_order == REVERSE_TICKET_ORDER: self.ui_new_ticket_no_str = "-1"
-        else: self.ui_new_ticket_no_str = str(self.game_total_tickets)
-        self._textfield_error_message = None
-        if self.ui_new_ticket_no_ref:
-            self.ui_new_ticket_no_ref.value = self.ui_new_ticket_no_str
-            self.ui_new_ticket_no_ref.error_text = None
-            if self.ui_new_ticket_no_ref.page: self.ui_new_ticket_no_ref.update()
+        self.ui_new_ticket_no_str = self._all_sold_ticket_str
+        if self.ui_new_ticket_no_ref: self.ui_new_ticket_no_ref.value = self.ui_new_ticket_no_str
         if self._calculate_sales(): self.on_change_callback(self)
+        else: self._push_textfield_update()
 
     def _handle_textfield_change(self, e: ft.ControlEvent):
         current_tf_value = e.control.value.strip()
         if current_tf_value == self.ui_new_ticket_no_str and e.control.error_text == self._textfield_error_message: return
         self.ui_new_ticket_no_str = current_tf_value
         if self.all_tickets_sold_confirmed:
-            is_all_sold_value_still_typed = \
-                (self.ticket_order == REVERSE_TICKET_ORDER and self.ui_new_ticket_no_str == "-1") or \
-                (self.ticket_order == FORWARD_TICKET_ORDER and self.ui_new_ticket_no_str == str(self.game_total_tickets))
+            is_all_sold_value_still_typed = self.ui_new_ticket_no_str == self._all_sold_ticket_str
             if not is_all_sold_value_still_typed: self.all_tickets_sold_confirmed = False
-        meaningful_change = self._calculate_sales()
-        if self.ui_new_ticket_no_ref:
-            if self.ui_new_ticket_no_ref.error_text != self._textfield_error_message:
-                self.ui_new_ticket_no_ref.error_text = self._textfield_error_message; meaningful_change = True
-            if self.ui_new_ticket_no_ref.value != self.ui_new_ticket_no_str:
-                self.ui_new_ticket_no_ref.value = self.ui_new_ticket_no_str; meaningful_change = True
-            if self.ui_new_ticket_no_ref.page: self.ui_new_ticket_no_ref.update()
-        if meaningful_change: self.on_change_callback(self)
+        # The client already shows what the user typed, so the value is not pushed back from here.
+        if self._calculate_sales(): self.on_change_callback(self) # refresh_datarow() also syncs error_text
+        elif self.ui_new_ticket_no_ref and self.ui_new_ticket_no_ref.error_text != self._textfield_error_message:
+            # Sales figures are unchanged; only the TextField's error state is stale, so skip the row/totals redraw.
+            self.ui_new_ticket_no_ref.error_text = self._textfield_error_message
+            self._push_textfield_update()
+
+    def _push_textfield_update(self):
+        if self.ui_new_ticket_no_ref and self.ui_new_ticket_no_ref.page: self.ui_new_ticket_no_ref.update()
+
+    def push_row_update(self):
+        """Sends only this item's row to the client instead of diffing the whole page."""
+        if self._cached_row is not None and self._cached_row.page: self._cached_row.update()
 
     def get_data_for_submission(self) -> Dict[str, Union[int, str, bool]]:
         return {
@@ -154,6 +202,8 @@ class SalesEntryItemData:
         }
 
     def to_datarow(self) -> ft.DataRow:
+        """Returns this item's DataRow, building it on first use and reusing it afterwards."""
+        if self._cached_row is not None: return self._cached_row
         if self.ui_new_ticket_no_ref is None:
             self.ui_new_ticket_no_ref = ft.TextField(
                 hint_text="Tkt #", value=self.ui_new_ticket_no_str,
@@ -163,20 +213,39 @@ class SalesEntryItemData:
                 border_radius=6, text_size=13,
                 input_filter=ft.InputFilter(r"^-?[0-9]*$"),
                 error_text=self._textfield_error_message )
-        else:
-            self.ui_new_ticket_no_ref.value = self.ui_new_ticket_no_str
-            self.ui_new_ticket_no_ref.error_text = self._textfield_error_message
-
-        price_display_dollars = f"${(self.game_price_cents / 100.0):.2f}" # Display in dollars
-        amount_display_dollars = f"${(self.amount_calculated_cents / 100.0):.2f}" # Display in dollars
 
-        return ft.DataRow(
+        self._details_text = ft.Text(weight=ft.FontWeight.W_500, size=13)
+        self._price_text = ft.Text(text_align=ft.TextAlign.RIGHT, size=13)
+        self._cur_tkt_text = ft.Text(text_align=ft.TextAlign.RIGHT, size=13)
+        self._sold_text = ft.Text(text_align=ft.TextAlign.RIGHT, weight=ft.FontWeight.BOLD, size=13)
+        self._amount_text = ft.Text(text_align=ft.TextAlign.RIGHT, weight=ft.FontWeight.BOLD, size=13)
+        self._cached_row = ft.DataRow(
             cells=[
-                ft.DataCell(ft.Text(f"{self.game_name} | Game No: {self.book_model.game.game_number} | Book No: {self.book_number}", weight=ft.FontWeight.W_500, size=13)),
-                ft.DataCell(ft.Text(price_display_dollars, text_align=ft.TextAlign.RIGHT, size=13)),
-                ft.DataCell(ft.Text(str(self.db_current_ticket_no), text_align=ft.TextAlign.RIGHT, size=13)),
+                ft.DataCell(self._details_text),
+                ft.DataCell(self._price_text),
+                ft.DataCell(self._cur_tkt_text),
                 ft.DataCell(ft.Container(content=self.ui_new_ticket_no_ref, width=90, alignment=ft.alignment.center_right)),
-                ft.DataCell(ft.Text(str(self.tickets_sold_calculated), text_align=ft.TextAlign.RIGHT, weight=ft.FontWeight.BOLD, size=13)),
-                ft.DataCell(ft.Text(amount_display_dollars, text_align=ft.TextAlign.RIGHT, weight=ft.FontWeight.BOLD, size=13)),
-            ],
-            color=self.row_highlight_color )
\ No newline at end of file
+                ft.DataCell(self._sold_text),
+                ft.DataCell(self._amount_text),
+            ] )
+        self._refresh_book_details_cells()
+        self.refresh_datarow()
+        return self._cached_row
+
+    def _refresh_book_details_cells(self):
+        if self._cached_row is None: return
+        self._details_text.value = self._header_str
+        self._price_text.value = self._price_str
+        self._cur_tkt_text.value = str(self.db_current_ticket_no)
+
+    def refresh_datarow(self):
+        """Writes the sales state into the cached row's controls; only the changed values are assigned."""
+        if self._cached_row is None: return
+        sold_str = str(self.tickets_sold_calculated)
+        if self._sold_text.value != sold_str: self._sold_text.value = sold_str
+        amount_str = _fmt_cents(self.amount_calculated_cents) # Display in dollars
+        if self._amount_text.value != amount_str: self._amount_text.value = amount_str
+        if self._cached_row.color != self.row_highlight_color: self._cached_row.color = self.row_highlight_color
+        if self.ui_new_ticket_no_ref is not None:
+            if self.ui_new_ticket_no_ref.value != self.ui_new_ticket_no_str: self.ui_new_ticket_no_ref.value = self.ui_new_ticket_no_str
+            if self.ui_new_ticket_no_ref.error_text != self._textfield_error_message: self.ui_new_ticket_no_ref.error_text = self._textfield_error_message
@@ -1,11 +1,19 @@
+import threading
 import flet as ft
-from typing import List, Callable, Optional, Dict
+from contextlib import contextmanager
+from typing import List, Callable, Optional, Dict, Iterable
 from app.core.models import Book as BookModel
+from app.core.exceptions import ValidationError
 from app.services.sales_entry_service import SalesEntryService
 from app.data.database import get_db_session
 from .sales_entry_item_data import SalesEntryItemData
 import logging
 logger = logging.getLogger("lottery_manager_app")
+
+# Rows are materialized in chunks as the user scrolls, rather than one DataRow per active book up front.
+ROW_RENDER_CHUNK = 30
+LOAD_MORE_THRESHOLD_PX = 200
+
 class SalesEntryItemsTable(ft.Container):
     def __init__(self,
                  page_ref: ft.Page,
@@ -21,6 +29,12 @@ class SalesEntryItemsTable(ft.Container):
 
         self.sales_items_data_list: List[SalesEntryItemData] = []
         self.sales_items_map: Dict[str, SalesEntryItemData] = {}
+        self.sales_items_index: Dict[str, int] = {} # unique_id -> position in sales_items_data_list / datatable.rows
+        self._rendered_count: int = 0 # datatable.rows holds rows for sales_items_data_list[:_rendered_count]
+        self._submittable: Dict[str, SalesEntryItemData] = {} # Items that are processed or confirmed all-sold, kept live
+        self._batch_state = threading.local() # Per-thread batch depth: the load worker's batch never defers a scan handler's updates
+        self._loading: bool = False # True while a background load is building items; scans are refused until it swaps them in
+        self._items_lock = threading.RLock() # Guards the item list/map/index and rows against the load worker
 
         self.datatable = ft.DataTable(
             columns=[
@@ -33,78 +47,171 @@ class SalesEntryItemsTable(ft.Container):
             ],
             rows=[], column_spacing=15, heading_row_height=40, data_row_max_height=55, expand=True,
         )
-        self.content = ft.Column([self.datatable], scroll=ft.ScrollMode.ADAPTIVE, expand=True)
+        # Scrolling near the end renders the next chunk; this button covers a first chunk too short to scroll
+        self._show_more_button = ft.TextButton(icon=ft.Icons.EXPAND_MORE_ROUNDED, visible=False, on_click=self._handle_show_more_click)
+        self.content = ft.Column([self.datatable, self._show_more_button], scroll=ft.ScrollMode.ADAPTIVE, expand=True,
+                                 on_scroll=self._handle_scroll, on_scroll_interval=100,
+                                 horizontal_alignment=ft.CrossAxisAlignment.CENTER)
+
+    @property
+    def _batch_depth(self) -> int: return getattr(self._batch_state, "depth", 0) # > 0 while this thread is inside batch_updates()
+
+    @_batch_depth.setter
+    def _batch_depth(self, depth: int): self._batch_state.depth = depth
+
+    @property
+    def is_batching(self) -> bool: return self._batch_depth > 0
+
+    @property
+    def is_loading(self) -> bool: return self._loading
+
+    @contextmanager
+    def batch_updates(self, flush: bool = True):
+        """Defers this table's control updates; the outermost block sends one page update on exit (flush=False leaves it to the caller)."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if flush and self._batch_depth == 0 and self.page and self.page.controls: self.page.update()
+
+    def _handle_scroll(self, e: ft.OnScrollEvent):
+        if e.max_scroll_extent is None or e.pixels is None: return
+        if e.max_scroll_extent - e.pixels <= LOAD_MORE_THRESHOLD_PX and self._render_more_rows():
+            if self.content.page: self.content.update()
+
+    def _handle_show_more_click(self, e):
+        if self._render_more_rows() and self.content.page: self.content.update()
+
+    def _sync_show_more_button(self):
+        remaining = len(self.sales_items_data_list) - self._rendered_count
+        self._show_more_button.visible = remaining > 0
+        if remaining > 0: self._show_more_button.text = f"Show more books ({remaining} not shown)"
+
+    def _render_more_rows(self) -> bool:
+        """Appends the next chunk of not-yet-built rows. Returns False when every item is already rendered."""
+        start = self._rendered_count
+        end = min(start + ROW_RENDER_CHUNK, len(self.sales_items_data_list))
+        if start >= end: return False
+        self.datatable.rows.extend(item.to_datarow() for item in self.sales_items_data_list[start:end])
+        self._rendered_count = end
+        self._sync_show_more_button()
+        return True
+
+    def _sync_submittable(self, item_data: SalesEntryItemData):
+        if self.sales_items_map.get(item_data.unique_id) is not item_data: return # A row from before the last reload
+        if item_data.is_processed_for_sale or item_data.all_tickets_sold_confirmed: self._submittable[item_data.unique_id] = item_data
+        else: self._submittable.pop(item_data.unique_id, None)
 
     def _internal_item_change_handler(self, item_data: SalesEntryItemData):
+        self._sync_submittable(item_data) # Items only report changes that may flip these flags through this callback
+        if item_data._bulk: return # The caller driving the bulk change renders once when it is done
         self.update_datarow_for_item(item_data.unique_id)
         self.on_item_change_callback(item_data)
-        if self.page: self.page.update()
+
+    def _reindex(self, upto: Optional[int] = None):
+        end = len(self.sales_items_data_list) if upto is None else upto + 1
+        for i in range(end): self.sales_items_index[self.sales_items_data_list[i].unique_id] = i
+
+    def load_initial_active_books_in_background(self):
+        """Shows a loading row and runs load_initial_active_books() on a worker thread so the view paints first."""
+        if not self.page: self.load_initial_active_books(); return
+        loading_row = ft.DataRow(cells=[
+            ft.DataCell(ft.Row([ft.ProgressRing(width=16, height=16, stroke_width=2), ft.Text("Loading active books...", italic=True)], spacing=8)),
+            *[ft.DataCell(ft.Text("")) for _ in range(len(self.datatable.columns) - 1)] ])
+        with self._items_lock:
+            self._loading = True
+            self._install_items([], [loading_row]) # The only reset: old rows and totals clear while the worker builds
+        self.page.run_thread(self.load_initial_active_books)
+
+    def _install_items(self, items: List[SalesEntryItemData], rows: List[ft.DataRow]):
+        """Swaps in a complete item list and its first rows (or a placeholder row when items is empty). Call under _items_lock."""
+        self.sales_items_data_list = items
+        self.sales_items_map = {item.unique_id: item for item in items}
+        self.sales_items_index = {item.unique_id: i for i, item in enumerate(items)}
+        self._submittable = {item.unique_id: item for item in items if item.is_processed_for_sale or item.all_tickets_sold_confirmed}
+        self._rendered_count = min(len(rows), len(items))
+        self.datatable.rows = rows
+        self._sync_show_more_button()
 
     def load_initial_active_books(self):
-        self.sales_items_data_list = []
-        self.sales_items_map = {}
+        """Builds the items and their first rows in locals, then swaps them in at once and sends one update."""
+        items: List[SalesEntryItemData] = []
         try:
             with get_db_session() as db:
                 active_books: List[BookModel] = self.sales_entry_service.get_active_books_for_sales_display(db)
-            for book_model in active_books:
-                if book_model.id is None: continue
-                item_data = SalesEntryItemData(book_model=book_model, on_change_callback=self._internal_item_change_handler)
-                self.sales_items_data_list.append(item_data)
-                self.sales_items_map[item_data.unique_id] = item_data
-            self.sales_items_data_list.sort(key=lambda x: (x.book_model.game.game_number, x.book_number))
-            self.datatable.rows = [item.to_datarow() for item in self.sales_items_data_list]
-            self.on_all_items_loaded_callback(self.sales_items_data_list)
+                # Built while the session is open so every book_model.game read hits the already-joined Game
+                for book_model in active_books: # Already in display order from SQL
+                    if book_model.id is None: continue
+                    items.append(SalesEntryItemData(book_model=book_model, on_change_callback=self._internal_item_change_handler))
+            rows, loaded = [item.to_datarow() for item in items[:ROW_RENDER_CHUNK]], True
         except Exception as e:
             logger.error(f"Error loading active books for sales table: {e}", exc_info=True)
-            self.datatable.rows = [ft.DataRow(cells=[ft.DataCell(ft.Text(f"Error loading books: {e}", color=ft.Colors.ERROR))])]
-        if self.page and self.page.controls: self.page.update()
+            items, rows, loaded = [], [ft.DataRow(cells=[ft.DataCell(ft.Text(f"Error loading books: {e}", color=ft.Colors.ERROR))])], False
+        with self.batch_updates(): # Rows, totals and page go out in one update
+            with self._items_lock:
+                self._install_items(items, rows)
+                self._loading = False
+            if loaded: self.on_all_items_loaded_callback(self.sales_items_data_list)
+
+    def _apply_scan_to_item(self, item_data: SalesEntryItemData, scanned_ticket_str: Optional[str]):
+        item_data._bulk = True
+        try:
+            if scanned_ticket_str: item_data.update_scanned_ticket_number(scanned_ticket_str)
+            else: item_data._calculate_sales() # Reports no change, so the submittable sync below is what catches a flipped flag
+        finally:
+            item_data._bulk = False
+        self._sync_submittable(item_data)
 
     def add_or_update_book_for_sale(self, book_model: BookModel, scanned_ticket_str: Optional[str] = None) -> Optional[SalesEntryItemData]:
+        with self._items_lock:
+            if self._loading: raise ValidationError("Active books are still loading. Please scan again in a moment.")
+            return self._add_or_update_book_for_sale(book_model, scanned_ticket_str)
+
+    def _add_or_update_book_for_sale(self, book_model: BookModel, scanned_ticket_str: Optional[str]) -> Optional[SalesEntryItemData]:
         if book_model.id is None: return None
         unique_id = f"book-{book_model.id}"
         item_data = self.sales_items_map.get(unique_id)
         is_new_item_to_list = False
         if item_data:
-            try: self.sales_items_data_list.remove(item_data)
-            except ValueError: pass
-            item_data.book_model = book_model
-            item_data.db_current_ticket_no = book_model.current_ticket_number
-            item_data.game_name = book_model.game.name if book_model.game else item_data.game_name
-            item_data.game_price_cents = book_model.game.price if book_model.game else item_data.game_price_cents # Use game_price_cents
-            item_data.game_total_tickets = book_model.game.total_tickets if book_model.game else item_data.game_total_tickets
-            item_data.ticket_order = book_model.ticket_order
-            if scanned_ticket_str: item_data.update_scanned_ticket_number(scanned_ticket_str)
-            else: item_data._calculate_sales()
+            old_idx = self.sales_items_index[unique_id]
+            item_data.apply_book_model(book_model)
+            self._apply_scan_to_item(item_data, scanned_ticket_str)
+            # Move the existing row to the top; every other row keeps its control tree untouched.
+            self.sales_items_data_list.insert(0, self.sales_items_data_list.pop(old_idx))
+            if old_idx < self._rendered_count:
+                self.datatable.rows.insert(0, self.datatable.rows.pop(old_idx))
+            else:
+                self.datatable.rows.insert(0, item_data.to_datarow())
+                self._rendered_count += 1
+                self._sync_show_more_button()
+            self._reindex(upto=old_idx)
+            item_data.refresh_datarow()
         else:
             is_new_item_to_list = True
-            item_data = SalesEntryItemData(book_model=book_model, on_change_callback=self._internal_item_change_handler)
-            if scanned_ticket_str: item_data.update_scanned_ticket_number(scanned_ticket_str)
-            else: item_data._calculate_sales()
-            self.sales_items_map[unique_id] = item_data
+            item_data = SalesEntryItemData(book_model=book_model, on_change_callback=self._internal_item_change_handler, unique_id=unique_id)
+            self.sales_items_map[unique_id] = item_data # Registered first so the scan's submittable sync sees it as live
+            self._apply_scan_to_item(item_data, scanned_ticket_str)
+            if not self.sales_items_data_list: self.datatable.rows.clear() # Drop any placeholder/error row
+            self.sales_items_data_list.insert(0, item_data)
+            self.datatable.rows.insert(0, item_data.to_datarow())
+            self._rendered_count += 1
+            self._reindex()
 
-        self.sales_items_data_list.insert(0, item_data)
-        self.datatable.rows = [item.to_datarow() for item in self.sales_items_data_list]
         if is_new_item_to_list: self.on_all_items_loaded_callback(self.sales_items_data_list)
         else: self.on_item_change_callback(item_data)
-        if self.page and self.page.controls: self.page.update()
+        if not self.is_batching and self.content.page: self.content.update() # Rows and the show-more count
         return item_data
 
     def update_datarow_for_item(self, unique_item_id: str):
         item_data = self.sales_items_map.get(unique_item_id)
         if not item_data: return
-        try:
-            idx_in_list = -1
-            for i, current_item_data in enumerate(self.sales_items_data_list):
-                if current_item_data.unique_id == unique_item_id: idx_in_list = i; break
-            if idx_in_list != -1: self.datatable.rows[idx_in_list] = item_data.to_datarow()
-            else: self.datatable.rows = [item.to_datarow() for item in self.sales_items_data_list]
-        except Exception as e:
-            logger.error(f"SalesTable: Error updating specific datarow for {unique_item_id}: {e}. Rebuilding all rows.", exc_info=True)
-            self.datatable.rows = [item.to_datarow() for item in self.sales_items_data_list]
-        if self.page and self.page.controls: self.page.update()
+        item_data.refresh_datarow()
+        if not self.is_batching: item_data.push_row_update()
 
     def get_all_data_items(self) -> List[SalesEntryItemData]: return self.sales_items_data_list
-    def get_all_items_for_submission(self) -> List[SalesEntryItemData]:
-        return [item for item in self.sales_items_data_list if item.is_processed_for_sale or item.all_tickets_sold_confirmed]
+    def get_all_items_for_submission(self) -> List[SalesEntryItemData]: # In table display order, as submitted and confirmed
+        return [item for item in self.sales_items_data_list if item.unique_id in self._submittable]
+    def iter_submittable_items(self) -> Iterable[SalesEntryItemData]: return self._submittable.values() # Unordered; for totals
     def get_item_by_book_id(self, book_db_id: int) -> Optional[SalesEntryItemData]:
         return self.sales_items_map.get(f"book-{book_db_id}")
\ No newline at end of file
@@ -1,8 +1,7 @@
-from typing import List, Callable, Optional, Type, Dict, Any
+from typing import List, Callable, Optional, Dict, Any, Tuple
 import flet as ft
-import datetime
 
-from app.constants import ADMIN_ROLE, EMPLOYEE_ROLE, SALESPERSON_ROLE, MANAGED_USER_ROLES, ALL_USER_ROLES
+from app.constants import ADMIN_ROLE, SALESPERSON_ROLE, MANAGED_USER_ROLES, ALL_USER_ROLES
 from app.core.exceptions import WidgetError, ValidationError, DatabaseError, UserNotFoundError
 from app.core.models import User
 from app.services.user_service import UserService
@@ -10,6 +9,18 @@ from app.data.database import get_db_session
 from app.ui.components.common.paginated_data_table import PaginatedDataTable # Import base class
 from app.ui.components.common.dialog_factory import create_confirmation_dialog, create_form_dialog # Import dialog factory
 
+_ALL_ROLES = frozenset(ALL_USER_ROLES)
+_ROLE_DISPLAY = {role: role.capitalize() for role in ALL_USER_ROLES}
+# Dialog text templates; the reusable dialogs only swap the formatted strings in
+_EDIT_TITLE = "Edit User: {}".format
+_STATUS_CONFIRM_MESSAGE = "Are you sure you want to {} user '{}' (ID: {})?".format
+
+# Stateless column formatters, shared by every UsersTable instead of fresh lambdas per table
+def _format_text(val) -> ft.Text: return ft.Text(str(val))
+def _format_str(val: str) -> ft.Text: return ft.Text(val) # Already a string column; no str() call
+def _format_role(val) -> ft.Text: return ft.Text(_ROLE_DISPLAY.get(val) or str(val).capitalize())
+def _format_is_active(val_bool) -> ft.Text: return ft.Text("Yes" if val_bool else "No", color=ft.Colors.GREEN if val_bool else ft.Colors.RED)
+
 class UsersTable(PaginatedDataTable[User]):
     def __init__(self, page: ft.Page, user_service: UserService,
                  initial_roles_to_display: List[str], # Used for initial data fetch query
@@ -19,27 +30,42 @@ class UsersTable(PaginatedDataTable[User]):
         self.user_service = user_service
         self.initial_roles_to_display = initial_roles_to_display
         self.current_acting_user = current_acting_user # Store the acting user
-        if not self.initial_roles_to_display:
+        self._acting_user_id: Optional[int] = current_acting_user.id if current_acting_user else None # Read once, not per row
+        if not self.initial_roles_to_display or not _ALL_ROLES.intersection(self.initial_roles_to_display):
             raise WidgetError("User roles must be provided for UsersTable.")
+        self._fetch_all_roles: bool = _ALL_ROLES.issubset(self.initial_roles_to_display) # Checked once, not per fetch
         self._on_data_changed_callback = on_data_changed_callback
-        self.current_action_user: Optional[User] = None # For dialog context
+        self._users_by_id: Dict[int, User] = {} # Row actions carry only the id (control.data) and resolve the User here on click
+        self._created_date_strs: Dict[int, str] = {} # created_date never changes, so each user's is formatted once
+        self._row_cache: Dict[int, Tuple[tuple, ft.DataRow]] = {} # user.id -> (row signature, DataRow)
+        # Dialogs are created on first use and reused; page.open() keeps every new dialog in the page overlay
+        self._edit_dialog: Optional[ft.AlertDialog] = None
+        self._status_confirm_dialog: Optional[ft.AlertDialog] = None
+        # The three action-cell layouts, as (icon, tooltip, color, shared handler) specs; a row only fills in data=user.id
+        edit_spec = (ft.Icons.EDIT_ROUNDED, "Edit user", ft.Colors.PRIMARY, self._on_edit_click)
+        self._action_templates: Dict[str, Tuple[tuple, ...]] = {
+            "edit_only": (edit_spec,),
+            "deactivate": (edit_spec, (ft.Icons.DESKTOP_ACCESS_DISABLED_OUTLINED, "Deactivate user", ft.Colors.RED_ACCENT_700, self._on_deactivate_click)),
+            "reactivate": (edit_spec, (ft.Icons.DESKTOP_WINDOWS_ROUNDED, "Reactivate user", ft.Colors.GREEN_ACCENT_700, self._on_reactivate_click)),
+        }
 
         column_definitions: List[Dict[str, Any]] = [
             {"key": "id", "label": "ID", "sortable": True, "numeric": False, "searchable": False,
-             "display_formatter": lambda val: ft.Text(str(val))},
+             "display_formatter": _format_text},
             {"key": "username", "label": "Username", "sortable": True, "numeric": False, "searchable": True,
-             "display_formatter": lambda val: ft.Text(str(val))},
+             "display_formatter": _format_str},
             {"key": "role", "label": "Role", "sortable": True, "numeric": False, "searchable": True, # Role can be searched
-             "display_formatter": lambda val: ft.Text(str(val).capitalize())},
+             "display_formatter": _format_role},
             {"key": "created_date", "label": "Created Date (YYYY-MM-DD)", "sortable": True, "numeric": False, "searchable": False,
-             "display_formatter": lambda val_date: ft.Text(val_date.strftime("%Y-%m-%d %H:%M") if val_date else "")},
+             "display_formatter": lambda val_date, user: ft.Text(self._format_created_date(user))}, # Needs the per-table date cache
             {"key": "is_active", "label": "Is Active?", "sortable": True, "numeric": False, "searchable": False, # Not directly searchable as bool
-             "display_formatter": lambda val_bool: ft.Text("Yes" if val_bool else "No", color=ft.Colors.GREEN if val_bool else ft.Colors.RED)},
+             "display_formatter": _format_is_active},
         ]
 
         super().__init__(
             page=page,
-            fetch_all_data_func=self._fetch_users_data,
+            fetch_all_data_func=None, # Paging, sorting and search run in SQL via _fetch_users_page
+            fetch_page_func=self._fetch_users_page,
             column_definitions=column_definitions,
             action_cell_builder=self._build_action_cell,
             rows_per_page=10, # Users table might show more, adjust as needed
@@ -49,113 +75,116 @@ class UsersTable(PaginatedDataTable[User]):
             default_search_enabled=True, # UsersTable did not have search, keeping that look
         )
 
-    def _fetch_users_data(self, db_session) -> List[User]:
-        """Implements data fetching for users based on initial roles."""
-        # If self.initial_roles_to_display is empty or ALL, fetch all users
-        if not self.initial_roles_to_display or set(self.initial_roles_to_display) == set(ALL_USER_ROLES):
-            return self.user_service.get_all_users(db_session)
-        return self.user_service.get_users_by_roles(db_session, roles=self.initial_roles_to_display)
+    def _fetch_users_page(self, db_session, offset: int, limit: int, sort_key: Optional[str], ascending: bool, search: str) -> Tuple[List[User], int]:
+        """Fetches one page of users for the initial roles; only that page is held in memory.
+        The page holds lightweight rows exposing the User fields the table reads (id, username, role, created_date, is_active)."""
+        roles = None if self._fetch_all_roles else self.initial_roles_to_display
+        users, total = self.user_service.get_users_page(db_session, roles, offset, limit, sort_key, ascending, search)
+        self._users_by_id = {u.id: u for u in users}
+        for stale_id in self._row_cache.keys() - self._users_by_id.keys(): del self._row_cache[stale_id]
+        for stale_id in self._created_date_strs.keys() - self._users_by_id.keys(): del self._created_date_strs[stale_id]
+        return users, total
+
+    def _build_datarow(self, user: User) -> ft.DataRow:
+        # Every displayed value and action button derives from these fields, so an equal signature means an identical row
+        signature = (user.username, user.role, user.created_date, user.is_active)
+        cached = self._row_cache.get(user.id)
+        if cached is not None and cached[0] == signature: return cached[1]
+        row = super()._build_datarow(user)
+        self._row_cache[user.id] = (signature, row)
+        return row
+
+    def replace_item(self, updated_item: User, key: str = "id") -> bool:
+        self._users_by_id[updated_item.id] = updated_item
+        patched_in_place = super().replace_item(updated_item, key)
+        if patched_in_place and self._on_data_changed_callback: self._on_data_changed_callback() # The re-derive path already notified
+        return patched_in_place
+
+    def _format_created_date(self, user: User) -> str:
+        date_str = self._created_date_strs.get(user.id)
+        if date_str is None:
+            # Naive DateTime column, so this yields "YYYY-MM-DD HH:MM" without interpreting a strftime pattern
+            date_str = user.created_date.isoformat(sep=" ", timespec="minutes") if user.created_date else ""
+            self._created_date_strs[user.id] = date_str
+        return date_str
 
     def _build_action_cell(self, user: User, table_instance: PaginatedDataTable) -> ft.DataCell:
-        actions_controls = []
-        edit_button = ft.IconButton(
-            icon=ft.Icons.EDIT_ROUNDED, tooltip="Edit user", icon_color=ft.Colors.PRIMARY,
-            on_click=lambda e, u=user: self._open_edit_user_dialog(u)
-        )
-        actions_controls.append(edit_button)
-
         # Restriction: Salesperson users cannot be deactivated/reactivated from this generic table
         # Also, current acting user cannot deactivate/reactivate themselves.
-        can_toggle_active_status = True
-        if user.role == SALESPERSON_ROLE:
-            can_toggle_active_status = False
-        if self.current_acting_user and self.current_acting_user.id == user.id:
-            can_toggle_active_status = False
-
-
-        if can_toggle_active_status:
-            if user.is_active:
-                deactivate_button = ft.IconButton(
-                    icon=ft.Icons.DESKTOP_ACCESS_DISABLED_OUTLINED, tooltip="Deactivate user", icon_color=ft.Colors.RED_ACCENT_700,
-                    on_click=lambda e, u=user: self._confirm_deactivate_user_dialog(u)
-                )
-                actions_controls.append(deactivate_button)
-            else:
-                reactivate_button = ft.IconButton(
-                    icon=ft.Icons.DESKTOP_WINDOWS_ROUNDED, tooltip="Reactivate user", icon_color=ft.Colors.GREEN_ACCENT_700,
-                    on_click=lambda e, u=user: self._confirm_reactivate_user_dialog(u)
-                )
-                actions_controls.append(reactivate_button)
-
+        can_toggle_active_status = user.role != SALESPERSON_ROLE and user.id != self._acting_user_id
+        variant = ("deactivate" if user.is_active else "reactivate") if can_toggle_active_status else "edit_only"
+        actions_controls = [ft.IconButton(icon=icon, tooltip=tooltip, icon_color=color, data=user.id, on_click=handler)
+                            for icon, tooltip, color, handler in self._action_templates[variant]]
         return ft.DataCell(ft.Row(actions_controls, spacing=0, alignment=ft.MainAxisAlignment.END))
 
+    # Shared row-action handlers: each button carries its user's id in `data`
+    def _on_edit_click(self, e: ft.ControlEvent): self._open_edit_user_dialog(self._users_by_id[e.control.data])
+    def _on_deactivate_click(self, e: ft.ControlEvent): self._confirm_deactivate_user_dialog(self._users_by_id[e.control.data])
+    def _on_reactivate_click(self, e: ft.ControlEvent): self._confirm_reactivate_user_dialog(self._users_by_id[e.control.data])
+
     def _filter_and_sort_displayed_data(self, search_term: str = ""):
         super()._filter_and_sort_displayed_data(search_term)
         if self._on_data_changed_callback:
             self._on_data_changed_callback()
 
     # --- Dialog handling specific to UsersTable ---
-    def _close_dialog_and_refresh_users(self, dialog_to_close: Optional[ft.AlertDialog]=None, success_message: Optional[str]=None):
+    def _close_dialog(self, dialog_to_close: Optional[ft.AlertDialog]=None):
         if dialog_to_close and self.page.dialog == dialog_to_close:
             self.page.close(dialog_to_close)
-        if success_message and self.page:
-            self.page.open(ft.SnackBar(ft.Text(success_message), open=True))
-        self.refresh_data_and_ui() # Refresh user data
 
-    # --- Edit User Dialog (Complex Form Dialog - kept mostly as is but uses factory for shell) ---
+    def _close_dialog_and_refresh_users(self, dialog_to_close: Optional[ft.AlertDialog]=None, success_message: Optional[str]=None,
+                                        updated_user: Optional[User]=None, error_message: Optional[str]=None):
+        with self.batch_updates(): # Dialog close, snackbar and row changes go out as one page update
+            if dialog_to_close and self.page.dialog == dialog_to_close: dialog_to_close.open = False
+            if error_message: self.show_error_snackbar(error_message)
+            elif success_message and self.page:
+                self._show_snackbar(success_message)
+            if updated_user is not None: self.replace_item(updated_user) # Only this user changed, so skip the refetch
+            else: self.refresh_data_and_ui() # Refresh user data
+
+    # --- Edit User Dialog (built once on first use, then refilled for each user) ---
+    def _get_edit_dialog(self) -> ft.AlertDialog:
+        if self._edit_dialog is None:
+            self._edit_username_field = ft.TextField(label="Username", disabled=True)
+            self._edit_role_dropdown = ft.Dropdown(label="Role", options=[ft.dropdown.Option(role, role.capitalize()) for role in MANAGED_USER_ROLES])
+            self._edit_password_hint_text = ft.Text(italic=True, size=12)
+            self._edit_password_field = ft.TextField(label="New Password (optional)", password=True, can_reveal_password=True)
+            self._edit_confirm_password_field = ft.TextField(label="Confirm New Password", password=True, can_reveal_password=True)
+            self._edit_error_text = ft.Text(visible=False, color=ft.Colors.RED_700)
+            form_column = ft.Column(
+                [self._edit_username_field, self._edit_role_dropdown, self._edit_password_hint_text,
+                 self._edit_password_field, self._edit_confirm_password_field, self._edit_error_text],
+                tight=True, spacing=15, width=380, # Adjusted width slightly for message
+                scroll=ft.ScrollMode.AUTO
+            )
+            self._edit_dialog = create_form_dialog(
+                page=self.page,
+                title_text="",
+                form_content_column=form_column,
+                on_save_callback=lambda e: self._save_user_edits(self._edit_role_dropdown, self._edit_password_field, self._edit_confirm_password_field,
+                                                                 self._edit_error_text, self._edit_password_field.disabled),
+                on_cancel_callback=lambda ev: self._close_dialog(self.page.dialog) # type: ignore
+            )
+        return self._edit_dialog
+
     def _open_edit_user_dialog(self, user_to_edit: User): # Renamed user to user_to_edit
-        self.current_action_user = user_to_edit
 
         # Determine if password fields should be disabled
-        disable_password_fields = False
-        password_restriction_message = ""
-        if (self.current_acting_user and self.current_acting_user.role == ADMIN_ROLE and
-                user_to_edit.role == ADMIN_ROLE and self.current_acting_user.id != user_to_edit.id):
-            disable_password_fields = True
-            password_restriction_message = "Admin cannot change another admin's password."
-
-        # Form fields
-        username_field = ft.TextField(label="Username", value=user_to_edit.username, disabled=True)
-        role_options = [ft.dropdown.Option(role, role.capitalize()) for role in MANAGED_USER_ROLES]
-        role_dropdown = ft.Dropdown(
-            label="Role", options=role_options, value=user_to_edit.role,
-            disabled=(user_to_edit.role == SALESPERSON_ROLE or # Salesperson role cannot be changed
-                      (self.current_acting_user and self.current_acting_user.id == user_to_edit.id and user_to_edit.role == ADMIN_ROLE)) # Admin cannot change own role if they are the one being edited
-        )
-        password_field = ft.TextField(
-            label="New Password (optional)", password=True, can_reveal_password=True,
-            disabled=disable_password_fields
-        )
-        confirm_password_field = ft.TextField(
-            label="Confirm New Password", password=True, can_reveal_password=True,
-            disabled=disable_password_fields
-        )
-        error_text_edit = ft.Text(visible=False, color=ft.Colors.RED_700)
-
-        form_controls = [
-            username_field, role_dropdown,
-            ft.Text("Leave password fields blank to keep current password." if not disable_password_fields else password_restriction_message,
-                    italic=True, size=12, color=ft.Colors.ORANGE_ACCENT_700 if disable_password_fields else ft.Colors.ON_SURFACE_VARIANT),
-            password_field, confirm_password_field, error_text_edit,
-        ]
-
-        form_column = ft.Column(
-            form_controls,
-            tight=True, spacing=15, width=380, # Adjusted width slightly for message
-            scroll=ft.ScrollMode.AUTO
-        )
-
-        # Save handler needs access to these fields
-        def _save_edits_handler(e):
-            self._save_user_edits(role_dropdown, password_field, confirm_password_field, error_text_edit, disable_password_fields)
-
-        edit_dialog = create_form_dialog(
-            page=self.page,
-            title_text=f"Edit User: {user_to_edit.username}",
-            form_content_column=form_column,
-            on_save_callback=_save_edits_handler,
-            on_cancel_callback=lambda ev: self._close_dialog_and_refresh_users(self.page.dialog) # type: ignore
-        )
+        disable_password_fields = (self.current_acting_user is not None and self.current_acting_user.role == ADMIN_ROLE and
+                                   user_to_edit.role == ADMIN_ROLE and self.current_acting_user.id != user_to_edit.id)
+
+        edit_dialog = self._get_edit_dialog()
+        edit_dialog.data = user_to_edit # The dialog carries the user it edits; no shared table state
+        edit_dialog.title.value = _EDIT_TITLE(user_to_edit.username)
+        self._edit_username_field.value = user_to_edit.username
+        self._edit_role_dropdown.value = user_to_edit.role
+        self._edit_role_dropdown.disabled = bool(user_to_edit.role == SALESPERSON_ROLE or # Salesperson role cannot be changed
+                                                 (self.current_acting_user and self.current_acting_user.id == user_to_edit.id and user_to_edit.role == ADMIN_ROLE)) # Admin cannot change own role if they are the one being edited
+        self._edit_password_hint_text.value = "Admin cannot change another admin's password." if disable_password_fields else "Leave password fields blank to keep current password."
+        self._edit_password_hint_text.color = ft.Colors.ORANGE_ACCENT_700 if disable_password_fields else ft.Colors.ON_SURFACE_VARIANT
+        for field in (self._edit_password_field, self._edit_confirm_password_field):
+            field.value = ""; field.disabled = disable_password_fields
+        self._edit_error_text.value = ""; self._edit_error_text.visible = False
         self.page.dialog = edit_dialog
         self.page.open(self.page.dialog)
 
@@ -163,31 +192,34 @@ class UsersTable(PaginatedDataTable[User]):
     def _save_user_edits(self, role_field: ft.Dropdown, password_field: ft.TextField,
                          confirm_password_field: ft.TextField, error_text_edit: ft.Text,
                          password_fields_disabled: bool):
-        if not self.current_action_user: return
+        user_to_edit: Optional[User] = self._edit_dialog.data if self._edit_dialog else None
+        if not user_to_edit: return
 
         error_text_edit.value = ""
         error_text_edit.visible = False
 
         new_role = role_field.value
         new_password = None
-        if not password_fields_disabled:
-            new_password = password_field.value if password_field.value else None
-            confirm_new_password = confirm_password_field.value
-
-            # Password validation only if not disabled and new password provided
-            if new_password:
-                if len(new_password) < 6:
-                    raise ValidationError("New password must be at least 6 characters.")
-                if new_password != confirm_new_password:
-                    raise ValidationError("New passwords do not match.")
         try:
+            if not password_fields_disabled:
+                new_password = password_field.value if password_field.value else None
+                confirm_new_password = confirm_password_field.value
+
+                # Password validation only if not disabled and new password provided
+                if new_password:
+                    if len(new_password) < 6:
+                        raise ValidationError("New password must be at least 6 characters.")
+                    if new_password != confirm_new_password:
+                        raise ValidationError("New passwords do not match.")
             with get_db_session() as db:
-                self.user_service.update_user(
-                    db, user_id=self.current_action_user.id, # type: ignore
+                updated_user = self.user_service.update_user(
+                    db, user_id=user_to_edit.id,
                     password=new_password, role=new_role
                     # Note: is_active is handled by separate deactivate/reactivate actions
                 )
-            self._close_dialog_and_refresh_users(self.page.dialog, "User details updated successfully.") # type: ignore
+            # Closing the dialog, the snackbar and the row patch are flushed together in one page update
+            self._close_dialog_and_refresh_users(self.page.dialog, "User details updated successfully.", updated_user) # type: ignore
+            return
         except (ValidationError, DatabaseError, UserNotFoundError) as ex:
             error_text_edit.value = str(ex.message if hasattr(ex, 'message') else ex)
             error_text_edit.visible = True
@@ -195,65 +227,59 @@ class UsersTable(PaginatedDataTable[User]):
             error_text_edit.value = f"An unexpected error occurred: {ex_general}"
             error_text_edit.visible = True
 
-        if self.page: self.page.update() # Update dialog with error or after closing
-
-
-    # --- Confirmation Dialogs (Deactivate/Reactivate - use DialogFactory) ---
-    def _confirm_deactivate_user_dialog(self, user: User):
-        self.current_action_user = user
-        content = ft.Text(f"Are you sure you want to deactivate user '{user.username}' (ID: {user.id})?")
-        dialog = create_confirmation_dialog(
-            title_text="Confirm Deactivate", title_color=ft.Colors.RED_700, content_control=content,
-            on_confirm=self._handle_deactivate_confirmed,
-            on_cancel=lambda e: self._close_dialog_and_refresh_users(self.page.dialog), # type: ignore
-            confirm_button_text="Deactivate User",
-            confirm_button_style=ft.ButtonStyle(bgcolor=ft.Colors.RED_700, color=ft.Colors.WHITE)
-        )
+        if error_text_edit.page: error_text_edit.update() # Only the dialog's error line changed
+
+
+    # --- Confirmation Dialogs (Deactivate/Reactivate - one DialogFactory dialog, refilled per use) ---
+    def _open_status_confirm_dialog(self, user: User, title_text: str, color: str, message: str, confirm_text: str, on_confirm: Callable):
+        if self._status_confirm_dialog is None:
+            self._status_confirm_dialog = create_confirmation_dialog(
+                title_text="", content_control=ft.Text(), on_confirm=None,
+                on_cancel=lambda e: self._close_dialog(self.page.dialog), # type: ignore
+            )
+        dialog = self._status_confirm_dialog
+        dialog.title.value = title_text; dialog.title.color = color
+        dialog.content.value = message
+        confirm_button = dialog.actions[1]
+        confirm_button.text = confirm_text; confirm_button.on_click = on_confirm
+        confirm_button.data = user # Handlers read the target user from e.control.data
+        confirm_button.style = ft.ButtonStyle(bgcolor=color, color=ft.Colors.WHITE)
         self.page.dialog = dialog
         self.page.open(self.page.dialog)
 
-    def _handle_deactivate_confirmed(self, e=None):
-        if not self.current_action_user: return
-        user_to_deactivate = self.current_action_user
+    def _confirm_deactivate_user_dialog(self, user: User):
+        self._open_status_confirm_dialog(user, "Confirm Deactivate", ft.Colors.RED_700,
+                                         _STATUS_CONFIRM_MESSAGE("deactivate", user.username, user.id),
+                                         "Deactivate User", self._handle_deactivate_confirmed)
+
+    def _handle_deactivate_confirmed(self, e: ft.ControlEvent):
+        user_to_deactivate: Optional[User] = e.control.data
+        if not user_to_deactivate: return
         current_dialog = self.page.dialog
         try:
             with get_db_session() as db:
-                self.user_service.deactivate_user(db, user_id=user_to_deactivate.id) # type: ignore
-            self._close_dialog_and_refresh_users(current_dialog, f"User '{user_to_deactivate.username}' deactivated.")
+                updated_user = self.user_service.deactivate_user(db, user_id=user_to_deactivate.id) # type: ignore
+            self._close_dialog_and_refresh_users(current_dialog, f"User '{user_to_deactivate.username}' deactivated.", updated_user)
         except (UserNotFoundError, DatabaseError, ValidationError) as ex: # Added ValidationError
-            self.show_error_snackbar(str(ex.message if hasattr(ex, 'message') else ex))
-            self._close_dialog_and_refresh_users(current_dialog)
+            self._close_dialog_and_refresh_users(current_dialog, error_message=str(ex.message if hasattr(ex, 'message') else ex))
         except Exception as ex_general:
-            self.show_error_snackbar(f"An unexpected error: {ex_general}")
-            self._close_dialog_and_refresh_users(current_dialog)
-        finally: self.current_action_user = None
+            self._close_dialog_and_refresh_users(current_dialog, error_message=f"An unexpected error: {ex_general}")
 
 
     def _confirm_reactivate_user_dialog(self, user: User):
-        self.current_action_user = user
-        content = ft.Text(f"Are you sure you want to reactivate user '{user.username}' (ID: {user.id})?")
-        dialog = create_confirmation_dialog(
-            title_text="Confirm Reactivate", title_color=ft.Colors.GREEN_700, content_control=content,
-            on_confirm=self._handle_reactivate_confirmed,
-            on_cancel=lambda e: self._close_dialog_and_refresh_users(self.page.dialog), # type: ignore
-            confirm_button_text="Reactivate User",
-            confirm_button_style=ft.ButtonStyle(bgcolor=ft.Colors.GREEN_700, color=ft.Colors.WHITE)
-        )
-        self.page.dialog = dialog
-        self.page.open(self.page.dialog)
+        self._open_status_confirm_dialog(user, "Confirm Reactivate", ft.Colors.GREEN_700,
+                                         _STATUS_CONFIRM_MESSAGE("reactivate", user.username, user.id),
+                                         "Reactivate User", self._handle_reactivate_confirmed)
 
-    def _handle_reactivate_confirmed(self, e=None):
-        if not self.current_action_user: return
-        user_to_reactivate = self.current_action_user
+    def _handle_reactivate_confirmed(self, e: ft.ControlEvent):
+        user_to_reactivate: Optional[User] = e.control.data
+        if not user_to_reactivate: return
         current_dialog = self.page.dialog
         try:
             with get_db_session() as db:
-                self.user_service.reactivate_user(db, user_id=user_to_reactivate.id) # type: ignore
-            self._close_dialog_and_refresh_users(current_dialog, f"User '{user_to_reactivate.username}' reactivated.")
+                updated_user = self.user_service.reactivate_user(db, user_id=user_to_reactivate.id) # type: ignore
+            self._close_dialog_and_refresh_users(current_dialog, f"User '{user_to_reactivate.username}' reactivated.", updated_user)
         except (UserNotFoundError, DatabaseError, ValidationError) as ex: # Added ValidationError
-            self.show_error_snackbar(str(ex.message if hasattr(ex, 'message') else ex))
-            self._close_dialog_and_refresh_users(current_dialog)
+            self._close_dialog_and_refresh_users(current_dialog, error_message=str(ex.message if hasattr(ex, 'message') else ex))
         except Exception as ex_general:
-            self.show_error_snackbar(f"An unexpected error: {ex_general}")
-            self._close_dialog_and_refresh_users(current_dialog)
-        finally: self.current_action_user = None
\ No newline at end of file
+            self._close_dialog_and_refresh_users(current_dialog, error_message=f"An unexpected error: {ex_general}")
\ No newline at end of file
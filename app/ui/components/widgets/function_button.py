@@ -1,7 +1,14 @@
+from functools import lru_cache
 from typing import Any, Optional, Dict, Callable # Added Callable
 import flet as ft
 import logging
 logger = logging.getLogger("lottery_manager_app")
+
+@lru_cache(maxsize=256)
+def _with_opacity(opacity: float, color: str) -> str:
+    # Nav grids reuse a handful of (opacity, accent) pairs, so each color string is built once
+    return ft.Colors.with_opacity(opacity, color)
+
 def create_nav_card_button(
         router: Any,  # Can be your app's Router instance or page for page.go
         text: str,
@@ -21,22 +28,31 @@ def create_nav_card_button(
 ) -> ft.Card:
 
     effective_router_params = router_params if router_params is not None else {}
+    error_snackbar: Optional[ft.SnackBar] = None # Built on the first failure, then reused so repeat failures add no controls
 
     def handle_click(e: ft.ControlEvent):
+        nonlocal error_snackbar
         if disabled:
             return
 
-        if on_click_override:
-            on_click_override(e)
-        elif navigate_to_route:
-            if hasattr(router, 'navigate_to'):
-                router.navigate_to(navigate_to_route, **effective_router_params)
-            elif hasattr(router, 'go'): # For Flet's page.go
-                router.go(navigate_to_route)
+        try:
+            if on_click_override:
+                on_click_override(e)
+            elif navigate_to_route:
+                if hasattr(router, 'navigate_to'):
+                    router.navigate_to(navigate_to_route, **effective_router_params)
+                elif hasattr(router, 'go'): # For Flet's page.go
+                    router.go(navigate_to_route)
+                else:
+                    logger.warning("Router object not recognized or navigation method missing.")
             else:
-                logger.warning("Router object not recognized or navigation method missing.")
-        else:
-            logger.error(f"NavCard '{text}' clicked, but no navigation route or override handler defined.")
+                logger.error(f"NavCard '{text}' clicked, but no navigation route or override handler defined.")
+        except Exception as ex:
+            logger.error(f"NavCard '{text}' action failed: {ex}", exc_info=True)
+            if not e.page: return
+            if error_snackbar is None: error_snackbar = ft.SnackBar(ft.Text(), bgcolor=ft.Colors.ERROR)
+            error_snackbar.content.value = f"Could not open '{text}': {type(ex).__name__}"
+            e.page.open(error_snackbar) # Registered once; reopening an already-registered bar only updates it
 
 
     button_internal_content = ft.Column(
@@ -44,7 +60,7 @@ def create_nav_card_button(
             ft.Icon(
                 name=icon_name,
                 size=icon_size,
-                color=ft.Colors.with_opacity(0.9, accent_color) if not disabled else ft.Colors.ON_SURFACE_VARIANT,
+                color=_with_opacity(0.9, accent_color) if not disabled else ft.Colors.ON_SURFACE_VARIANT,
             ),
             ft.Container(height=5),
             ft.Text(
@@ -52,7 +68,7 @@ def create_nav_card_button(
                 weight=ft.FontWeight.W_500,
                 size=14,
                 text_align=ft.TextAlign.CENTER,
-                color=ft.Colors.with_opacity(0.85, accent_color) if not disabled else ft.Colors.ON_SURFACE_VARIANT,
+                color=_with_opacity(0.85, accent_color) if not disabled else ft.Colors.ON_SURFACE_VARIANT,
             ),
         ],
         alignment=ft.MainAxisAlignment.CENTER,
@@ -67,7 +83,7 @@ def create_nav_card_button(
         border_radius=ft.border_radius.all(border_radius),
         ink=not disabled,
         on_click=handle_click if not disabled else None,
-        bgcolor=ft.Colors.with_opacity(background_opacity, accent_color) if not disabled else ft.Colors.with_opacity(0.05, ft.Colors.ON_SURFACE),
+        bgcolor=_with_opacity(background_opacity, accent_color) if not disabled else _with_opacity(0.05, ft.Colors.ON_SURFACE),
         tooltip=tooltip if not disabled else "Disabled",
         height=height,
         width=width,
@@ -76,5 +92,5 @@ def create_nav_card_button(
     return ft.Card(
         content=clickable_area,
         elevation=5 if not disabled else 1,
-        shadow_color=ft.Colors.with_opacity(shadow_opacity, accent_color) if not disabled else ft.Colors.BLACK26,
+        shadow_color=_with_opacity(shadow_opacity, accent_color) if not disabled else ft.Colors.BLACK26,
     )
\ No newline at end of file
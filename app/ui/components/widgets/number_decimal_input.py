@@ -1,5 +1,25 @@
+import re
+from functools import lru_cache
+from decimal import Decimal, InvalidOperation
 import flet as ft
-from typing import Optional
+from typing import Iterable, Optional
+
+# Precompiled once; blur validation is a single match instead of isdigit()/float() with exceptions as control flow
+_INT_RE = re.compile(r"[0-9]+")
+_DECIMAL_RE = re.compile(r"[0-9]+(?:\.[0-9]*)?|\.[0-9]+")
+_NON_DIGITS_RE = re.compile(r"[^0-9]+") # ASCII only: str.isdigit() also accepts e.g. "²", which int() rejects
+
+@lru_cache(maxsize=1024) # Pure str -> str; retyping or backspacing over an amount hits the cache
+def _format_cents(digits: str) -> str:
+    """Formats a string of cents digits as "D.CC" by slicing, with no int/float round-trip (exact at any length)."""
+    padded = digits.lstrip("0").zfill(3)
+    return f"{padded[:-2]}.{padded[-2:]}"
+
+_MAX_SEED_CENTS = Decimal(10) ** 15 # Starting amounts at or above $10 trillion are treated as garbage, not formatted
+
+# Client-side filters for money fields: keystrokes the calculator would ignore anyway never reach Python
+_MONEY_INPUT_FILTER = ft.InputFilter(allow=True, regex_string=r"[0-9.]", replacement_string="")
+_SIGNED_MONEY_INPUT_FILTER = ft.InputFilter(allow=True, regex_string=r"[0-9.\-]", replacement_string="")
 
 class NumberDecimalField(ft.TextField):
     def __init__(self,
@@ -15,16 +35,20 @@ class NumberDecimalField(ft.TextField):
         self.is_money_field = is_money_field
         self.is_integer_only = is_integer_only
         self.allow_negative = allow_negative  # Store new parameter
+        # Resolved once: every handler and getter branches on this instead of re-testing both flags
+        self._is_calculator_money = is_money_field and not is_integer_only
+        self._standard_pattern = _INT_RE if is_integer_only else _DECIMAL_RE # Compiled pattern for blur/form validation
 
         # This internal state is ONLY for the special calculator-style money input
         self._internal_digits = ""
         self._internal_is_negative = False  # New state for the sign
 
         # --- Set up behavior based on field type ---
-        if self.is_money_field and not self.is_integer_only:
+        if self._is_calculator_money:
             # Special calculator-style money input
             kwargs['on_change'] = self._handle_money_change
-            kwargs['value'] = "0.00"  # Initial display
+            kwargs['value'] = self._seed_money_value(kwargs.get('value'))  # Initial display, "0.00" unless a starting amount was given
+            kwargs.setdefault('input_filter', _SIGNED_MONEY_INPUT_FILTER if self.allow_negative else _MONEY_INPUT_FILTER)
         else:
             # Standard behavior for integers and regular decimals
             # No input filter; we validate on blur for a better UX
@@ -37,10 +61,25 @@ class NumberDecimalField(ft.TextField):
         kwargs['label'] = label
         kwargs['hint_text'] = hint_text
         kwargs['keyboard_type'] = ft.KeyboardType.NUMBER
-        kwargs['prefix'] = ft.Text(currency_symbol) if is_money_field else None
+        kwargs['prefix_text'] = currency_symbol if is_money_field else None # A plain string property, not an extra Text control per field
 
         super().__init__(**kwargs)
 
+    def _seed_money_value(self, initial_value) -> str:
+        """Loads a starting amount (e.g. "2.50" or 2.5) into the calculator state and returns its display text.
+        Anything unparseable, non-finite, or negative when allow_negative is off starts the field empty."""
+        text = str(initial_value).strip() if initial_value is not None else ""
+        try:
+            cents = (Decimal(text) * 100).to_integral_value() if text else Decimal(0)
+            if not cents.is_finite() or abs(cents) >= _MAX_SEED_CENTS: cents = Decimal(0)
+            elif cents < 0 and not self.allow_negative: cents = Decimal(0) # Rejected, not silently made positive
+        except InvalidOperation:
+            cents = Decimal(0)
+        self._internal_is_negative = cents < 0
+        self._internal_digits = format(abs(cents), 'f') if cents else "" # Plain digits; str() would give e.g. "1E+402"
+        formatted_value = _format_cents(self._internal_digits)
+        return "-" + formatted_value if self._internal_is_negative else formatted_value
+
     def _handle_money_change(self, e: ft.ControlEvent):
         """Handles the special calculator-style input for money fields, now with negative support."""
         raw_value = e.control.value or ""
@@ -49,7 +88,7 @@ class NumberDecimalField(ft.TextField):
         if self.allow_negative and raw_value.strip().startswith('-'):
             is_negative = True
 
-        new_digits = "".join(filter(str.isdigit, raw_value))
+        new_digits = _NON_DIGITS_RE.sub("", raw_value)
 
         # Avoid recursion/unnecessary updates
         if new_digits == self._internal_digits and is_negative == self._internal_is_negative:
@@ -64,8 +103,7 @@ class NumberDecimalField(ft.TextField):
             if self._internal_is_negative:
                 formatted_value = "-0.00"
         else:
-            numeric_value = int(self._internal_digits)
-            formatted_value = f"{numeric_value / 100.0:.2f}"
+            formatted_value = _format_cents(self._internal_digits)
             if self._internal_is_negative:
                 formatted_value = "-" + formatted_value
 
@@ -85,46 +123,68 @@ class NumberDecimalField(ft.TextField):
                 e.control.update()
             return
 
-        try:
-            if self.is_integer_only:
-                # Allows only whole numbers
-                if not value.isdigit():
-                    raise ValueError("Contains non-digit characters.")
-                e.control.value = str(int(value))
-            else:  # Standard decimal
-                # Allows a valid floating point number
-                if value.count('.') > 1:
-                    raise ValueError("Contains multiple decimal points.")
-                float(value)  # This will raise ValueError if invalid format like "1.2.3" or "."
-
-            # If we reach here, the number is valid. Clear any previous error.
+        prev_value, prev_error = e.control.value, e.control.error_text
+        is_valid = self._is_valid_standard(value)
+        if is_valid and self.is_integer_only: e.control.value = str(int(value))
+
+        # Clear any previous error once the number is valid
+        if is_valid:
             if e.control.error_text:
                 e.control.error_text = None
-        except ValueError:
+        else:
             e.control.error_text = "Invalid number"
 
-        e.control.update()
-
-    def get_value_as_float(self) -> Optional[float]:
-        """Returns the current value as a float, or None if invalid."""
-        if self.is_money_field and not self.is_integer_only:
-            return float(self.value) if self.value else 0.0
+        # Blurring an already valid (or already flagged) field changes nothing, so skip the round-trip
+        if e.control.value != prev_value or e.control.error_text != prev_error:
+            e.control.update()
 
-        value = self.value.strip()
+    def _is_valid_standard(self, value: str) -> bool:
+        """Checks a stripped, non-empty standard-field value against the integer or decimal pattern."""
+        unsigned = value[1:] if self.allow_negative and value.startswith('-') else value
+        # Integers: whole numbers only. Decimals: at most one decimal point, e.g. "10", "10.5", ".5" (but not "." or "1.2.3")
+        return self._standard_pattern.fullmatch(unsigned) is not None
+
+    @classmethod
+    def validate_many(cls, fields: Iterable["NumberDecimalField"], flush: bool = True) -> bool:
+        """Flags every invalid field in one pass and pushes all error changes with a single page.update()
+        (flush=False leaves that to a caller that updates anyway). Empty fields are not flagged (required
+        checks stay with the form). Returns True if all fields are valid."""
+        all_valid, changed_page = True, None
+        for field in fields:
+            if field._is_calculator_money: continue # The calculator state is always a valid amount
+            value = field.value.strip() if field.value else ""
+            is_valid = not value or field._is_valid_standard(value)
+            all_valid = all_valid and is_valid
+            error_text = None if is_valid else "Invalid number"
+            if (field.error_text or None) != error_text: # A cleared error_text reads back as ""
+                field.error_text = error_text
+                changed_page = changed_page or field.page
+        if flush and changed_page: changed_page.update()
+        return all_valid
+
+    def _get_value_as_decimal(self) -> Optional[Decimal]:
+        """Parses the current value once, exactly; None if empty, invalid or not finite.
+        Money fields parse the displayed value too, so a programmatic `field.value = "5.00"` is what the getters return."""
+        value = self.value.strip() if self.value else ""
         if not value:
             return None
         try:
-            return float(value)
-        except (ValueError, TypeError):
+            number = Decimal(value)
+        except InvalidOperation:
             return None
+        return number if number.is_finite() else None
+
+    def get_value_as_float(self) -> Optional[float]:
+        """Returns the current value as a float, or None if invalid."""
+        number = self._get_value_as_decimal()
+        return float(number) if number is not None else None
 
     def get_value_as_int(self) -> Optional[int]:
         """Returns the current value as an integer, or None if invalid."""
-        float_val = self.get_value_as_float()
-        if float_val is not None:
-            # Check if it's a whole number before converting
-            if float_val == int(float_val):
-                return int(float_val)
+        number = self._get_value_as_decimal()
+        # Only whole numbers convert; Decimal keeps long digit strings exact where a float round-trip would not
+        if number is not None and number == number.to_integral_value():
+            return int(number)
         return None
 
     def get_value_as_str(self) -> str:
@@ -133,12 +193,15 @@ class NumberDecimalField(ft.TextField):
 
     def clear(self):
         """Clears the input field and resets its state."""
-        if self.is_money_field and not self.is_integer_only:
-            self.value = "0.00"
+        if self._is_calculator_money:
+            cleared_value = "0.00"
             self._internal_digits = ""
             self._internal_is_negative = False  # Reset the sign state
         else:
-            self.value = ""
+            cleared_value = ""
+        if self.value == cleared_value and not self.error_text:
+            return  # Already cleared; resetting a whole form shouldn't send a no-op update per field
+        self.value = cleared_value
         self.error_text = None
         if self.page:  # Check if page is available before updating
             self.update()
\ No newline at end of file
@@ -1,3 +1,5 @@
+import functools
+
 import flet as ft
 
 from app.ui.views.admin import SalesEntryView
@@ -42,6 +44,9 @@ class Router:
             GAME_EXPIRY_REPORT_ROUTE: GameExpiryReportView,
             STOCK_LEVELS_REPORT_ROUTE: StockLevelsReportView,
         }
+        # View factories with page/router pre-bound, so navigation is one dict lookup plus the route's own params
+        self._factories = {name: functools.partial(view_class, page=self.page, router=self) for name, view_class in self.routes.items()}
+        self._login_factory = self._factories[LOGIN_ROUTE]
         self.current_view_instance = None # Keep track of the current view instance
         self.current_route_name = None    # Keep track of current route name
 
@@ -60,11 +65,11 @@ class Router:
 
         self.current_route_name = route_name
 
-        if route_name in self.routes:
-            view_class = self.routes[route_name]
+        view_factory = self._factories.get(route_name)
+        if view_factory is not None:
             try:
-                # Instantiate the view, passing the page, router, and any other params
-                self.current_view_instance = view_class(page=self.page, router=self, **params)
+                # Instantiate the view; page and router are already bound, pass any other params
+                self.current_view_instance = view_factory(**params)
                 self.page.add(self.current_view_instance)
             except Exception as e:
                 logger.error(f"Error instantiating view for route '{route_name}': {e}", exc_info=True)
@@ -79,8 +84,7 @@ class Router:
             logger.error(f"Error: Route '{route_name}' not found. Navigating to login as fallback.", exc_info=True)
             self.page.controls.clear()
             # Fallback to login view if route is unknown (should ideally not happen if initial check is correct)
-            login_view_class = self.routes[LOGIN_ROUTE]
-            self.current_view_instance = login_view_class(page=self.page, router=self) # No params for login usually
+            self.current_view_instance = self._login_factory() # No params for login usually
             self.page.add(self.current_view_instance)
             self.current_route_name = LOGIN_ROUTE
 
@@ -88,6 +88,10 @@ class GameManagementView(ft.Container):
 
         def _save_new_game_handler(ev):
             error_text_add.value = ""; error_text_add.visible = False # Reset error
+            # Bad numbers are flagged on their fields and stop the save before any service call
+            if not NumberDecimalField.validate_many((game_number_field, price_field, total_tickets_field), flush=False):
+                if form_column.page: form_column.update()
+                return
             try:
                 game_name = game_name_field.value
                 price_dollars = price_field.get_value_as_float() # Returns float or None
@@ -114,7 +118,7 @@ class GameManagementView(ft.Container):
             except Exception as ex_general: # Catch any other unexpected error
                 error_text_add.value = f"An unexpected error occurred: {type(ex_general).__name__} - {ex_general}"
                 error_text_add.visible = True
-            if error_text_add.page: error_text_add.update()
+            if form_column.page: form_column.update() # The error line and any field errors validate_many cleared
 
 
         add_game_dialog = create_form_dialog(
@@ -52,6 +52,9 @@ class SalesEntryView(ft.Container):
             current_user=self.current_user, license_status=self.license_status,
             leading_widget=ft.IconButton(icon=ft.Icons.ARROW_BACK_IOS_NEW_ROUNDED, tooltip="Go Back", icon_color=ft.Colors.WHITE, on_click=self._go_back ))
         self.content = self._build_body()
+
+    def did_mount(self):
+        # Loaded once the router has added the view, so the worker never races the view's first paint
         self._load_initial_data_for_table()
 
     def _go_back(self, e):
@@ -59,7 +62,8 @@ class SalesEntryView(ft.Container):
         self.router.navigate_to(self.previous_view_route, **nav_params)
 
     def _load_initial_data_for_table(self):
-        if self.sales_items_table_component: self.sales_items_table_component.load_initial_active_books()
+        # Books load on a worker thread; the table refreshes itself and the totals when they arrive
+        if self.sales_items_table_component: self.sales_items_table_component.load_initial_active_books_in_background()
         for field in [self.reported_online_sales_field, self.reported_online_payouts_field, self.reported_instant_payouts_field, self.actual_cash_in_drawer_field]:
             if hasattr(field, 'clear'):
                 field.clear()
@@ -81,21 +85,24 @@ class SalesEntryView(ft.Container):
 
     def _handle_table_items_loaded(self, all_items: List[SalesEntryItemData]):
         self._update_totals_and_book_counts_properties()
+        if self.sales_items_table_component and self.sales_items_table_component.is_batching: return # The batch owner sends the page update
         if self.page and self.page.controls: self.page.update()
 
     def _update_totals_and_book_counts_properties(self, changed_item_data: Optional[SalesEntryItemData] = None):
         if not self.sales_items_table_component: return
         all_display_items = self.sales_items_table_component.get_all_data_items()
+        submittable_items = list(self.sales_items_table_component.iter_submittable_items()) # Order doesn't matter for sums
 
         # amount_calculated_cents is now in cents
-        grand_total_instant_sales_cents = sum(item.amount_calculated_cents for item in all_display_items if item.is_processed_for_sale or item.all_tickets_sold_confirmed)
-        total_instant_tickets_sold_val = sum(item.tickets_sold_calculated for item in all_display_items if item.is_processed_for_sale or item.all_tickets_sold_confirmed)
+        grand_total_instant_sales_cents = sum(item.amount_calculated_cents for item in submittable_items)
+        total_instant_tickets_sold_val = sum(item.tickets_sold_calculated for item in submittable_items)
         pending_entry_count = sum(1 for item in all_display_items if not item.ui_new_ticket_no_str.strip() and not item.all_tickets_sold_confirmed)
 
         self.grand_total_sales_widget.value = f"Grand Total Instant Sales: ${(grand_total_instant_sales_cents / 100.0):.2f}" # Display in dollars
         self.total_tickets_sold_widget.value = f"Total Instant Tickets Sold: {total_instant_tickets_sold_val}"
         self.books_in_table_count_widget.value = f"Books In Table: {len(all_display_items)}"
         self.pending_entry_books_count_widget.value = f"Pending Entry: {pending_entry_count}"
+        if self.sales_items_table_component.is_batching: return # Sent with the batch owner's page update
         for widget in [self.grand_total_sales_widget, self.total_tickets_sold_widget, self.books_in_table_count_widget, self.pending_entry_books_count_widget]:
             if widget.page: widget.update()
 
@@ -112,10 +119,13 @@ class SalesEntryView(ft.Container):
 
     def _process_scan_and_update_table(self, game_no_str: str, book_no_str: str, ticket_no_str: str):
         self._clear_scan_error_properties()
+        if self.sales_items_table_component and self.sales_items_table_component.is_loading: # Checked before the DB call so nothing is created for a refused scan
+            self._on_scan_error_callback("Active books are still loading. Please scan again in a moment."); return
         try:
             with get_db_session() as db: book_model_instance = self.sales_entry_service.get_or_create_book_for_sale(db, game_no_str, book_no_str)
-            if self.sales_items_table_component: self.sales_items_table_component.add_or_update_book_for_sale(book_model_instance, ticket_no_str)
-            else: raise Exception("Sales items table component not initialized.")
+            if not self.sales_items_table_component: raise Exception("Sales items table component not initialized.")
+            # One page update for the row, the totals and the scan field instead of one per step
+            with self.sales_items_table_component.batch_updates(flush=False): self.sales_items_table_component.add_or_update_book_for_sale(book_model_instance, ticket_no_str)
         except (ValidationError, GameNotFoundError, BookNotFoundError, DatabaseError) as e: self._on_scan_error_callback(str(e.message if hasattr(e, 'message') else e))
         except Exception as ex_general: self._on_scan_error_callback(f"Error processing scan: {type(ex_general).__name__} - {ex_general}")
         if self.scan_input_handler: self.scan_input_handler.focus_input()
@@ -141,11 +151,11 @@ class SalesEntryView(ft.Container):
         # get_data_for_submission now returns 'amount_calculated_cents'
         instant_sales_items_data_for_submission = [item.get_data_for_submission() for item in self.sales_items_table_component.get_all_items_for_submission()]
         all_current_table_items = self.sales_items_table_component.get_all_data_items()
+        submitted_book_ids = {sub_item["book_db_id"] for sub_item in instant_sales_items_data_for_submission}
         items_with_empty_fields: List[SalesEntryItemData] = []
         for item_data in all_current_table_items:
             if not item_data.ui_new_ticket_no_str.strip() and not item_data.all_tickets_sold_confirmed:
-                is_already_for_submission = any(sub_item["book_db_id"] == item_data.book_db_id for sub_item in instant_sales_items_data_for_submission)
-                if not is_already_for_submission: items_with_empty_fields.append(item_data)
+                if item_data.book_db_id not in submitted_book_ids: items_with_empty_fields.append(item_data)
         if items_with_empty_fields:
             self._prompt_for_empty_field_books_confirmation(items_with_empty_fields, reported_online_sales_float, reported_online_payouts_float, reported_instant_payouts_float, actual_cash_in_drawer_float, instant_sales_items_data_for_submission )
         else:
@@ -157,11 +167,13 @@ class SalesEntryView(ft.Container):
         def _handle_dialog_choice(mark_as_all_sold: bool):
             self.page.close(self.page.dialog) # type: ignore
             updated_sales_item_details = list(current_sales_item_details)
-            if mark_as_all_sold:
-                for item_data in items_to_confirm:
-                    item_data.confirm_all_sold()
-                    if self.sales_items_table_component: self.sales_items_table_component.update_datarow_for_item(item_data.unique_id)
-                    updated_sales_item_details.append(item_data.get_data_for_submission()) # Will include amount_calculated_cents
+            if mark_as_all_sold and self.sales_items_table_component:
+                # Rows are pushed by the page.update() at the end of this handler rather than one by one
+                with self.sales_items_table_component.batch_updates(flush=False):
+                    for item_data in items_to_confirm:
+                        item_data.confirm_all_sold()
+                        self.sales_items_table_component.update_datarow_for_item(item_data.unique_id)
+                        updated_sales_item_details.append(item_data.get_data_for_submission()) # Will include amount_calculated_cents
             self._update_totals_and_book_counts_properties()
             self._open_confirm_shift_submission_dialog(reported_online_sales_float, reported_online_payouts_float, reported_instant_payouts_float, actual_cash_in_drawer_float, updated_sales_item_details )
             if self.page: self.page.update()
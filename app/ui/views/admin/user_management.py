@@ -49,7 +49,7 @@ class AdminUserManagementView(ft.Container):
 
     def _handle_add_user_click(self, e): self._open_add_user_dialog()
     def _close_active_dialog(self, e=None):
-        if self.page.dialog: self.page.close(self.page.dialog); self.page.update()
+        if self.page.dialog: self.page.close(self.page.dialog) # page.close() already pushes the change
 
     def _open_add_user_dialog(self):
         username_field = ft.TextField(label="Username", autofocus=True, border_radius=8)